@@ -188,7 +188,7 @@ async def generate_plan(
     course_service: CourseService = Depends(get_course_service),
 ) -> GeneratePlanResponse:
     """Generate a course plan for the given topic using user's API key.
-    
+
     The API key is used only for this request and is never stored.
     """
     try:
@@ -215,7 +215,7 @@ async def test_connection(
     course_service: CourseService = Depends(get_course_service),
 ) -> TestConnectionResponse:
     """Test API key validity with a minimal request.
-    
+
     The API key is used only for this test and is never stored.
     """
     try:
@@ -264,7 +264,7 @@ class FetchLocalModelsResponse(BaseModel):
 @router.post("/courses/test-local-connection", response_model=TestConnectionResponse)
 async def test_local_connection(request: TestLocalConnectionRequest) -> TestConnectionResponse:
     """Test connection to local LLM via tunnel.
-    
+
     Uses the bridge token for authentication.
     """
     try:
@@ -287,7 +287,7 @@ async def test_local_connection(request: TestLocalConnectionRequest) -> TestConn
 @router.post("/courses/local-models", response_model=FetchLocalModelsResponse)
 async def fetch_local_models(request: FetchLocalModelsRequest) -> FetchLocalModelsResponse:
     """Fetch available models from local LLM server.
-    
+
     Uses the bridge token for authentication.
     """
     try:
@@ -358,7 +358,7 @@ async def generate_level_content(
     course_service: CourseService = Depends(get_course_service),
 ) -> LevelContentResponse:
     """Generate content for a specific level using user's API key.
-    
+
     The API key is used only for this request and is never stored.
     """
     try:
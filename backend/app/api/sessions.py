@@ -180,7 +180,6 @@ async def export_json(
 async def import_circuit(
     code: str,
     request: ImportCircuitRequest,
-    circuit_service: CircuitService = Depends(get_circuit_service),
     session_service: SessionService = Depends(get_session_service),
 ) -> ImportCircuitResponse:
     """Import circuit from JSON."""
@@ -191,11 +190,11 @@ async def import_circuit(
         # Validate and parse circuit state
         try:
             imported_state = CircuitState.model_validate(request.circuit)
-        except Exception:
+        except Exception as e:
             raise ValidationException(
                 message="Invalid circuit file",
                 code="INVALID_CIRCUIT_FILE",
-            )
+            ) from e
 
         # For now, we'll just validate the import
         # Full import would require clearing existing state and adding all components
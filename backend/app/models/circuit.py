@@ -1,7 +1,7 @@
 """Circuit state Pydantic models."""
 
 from datetime import datetime
-from enum import Enum
+from enum import Enum, StrEnum
 from typing import Any, Literal
 
 from pydantic import BaseModel, Field
@@ -16,7 +16,7 @@ class Position(BaseModel):
     y: float
 
 
-class PinType(str, Enum):
+class PinType(StrEnum):
     """Pin type enumeration."""
 
     INPUT = "input"
@@ -40,7 +40,7 @@ class StrokeWidth(int, Enum):
     THICK = 8
 
 
-class ComponentType(str, Enum):
+class ComponentType(StrEnum):
     """All available component types."""
 
     # Logic Gates (Basic)
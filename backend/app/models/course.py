@@ -1,13 +1,13 @@
 """Course and level Pydantic models for LLM Course Generator."""
 
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 
-class Difficulty(str, Enum):
+class Difficulty(StrEnum):
     """Course difficulty level."""
 
     BEGINNER = "Beginner"
@@ -15,7 +15,7 @@ class Difficulty(str, Enum):
     ADVANCED = "Advanced"
 
 
-class GenerationState(str, Enum):
+class GenerationState(StrEnum):
     """Level content generation state."""
 
     NOT_QUEUED = "not_queued"
@@ -26,7 +26,7 @@ class GenerationState(str, Enum):
     FAILED = "failed"
 
 
-class LevelStatus(str, Enum):
+class LevelStatus(StrEnum):
     """Student's progress status on a level."""
 
     NOT_STARTED = "not_started"
@@ -1,15 +1,15 @@
 """Event sourcing event models."""
 
 from datetime import datetime
-from enum import Enum
-from typing import Literal, Union
+from enum import StrEnum
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
 from app.models.circuit import Annotation, CircuitComponent, Position, Wire
 
 
-class CircuitEventType(str, Enum):
+class CircuitEventType(StrEnum):
     """Circuit event types for event sourcing."""
 
     COMPONENT_ADDED = "COMPONENT_ADDED"
@@ -132,12 +132,12 @@ class AnnotationDeletedEvent(BaseEvent):
     payload: AnnotationDeletedPayload
 
 
-CircuitEvent = Union[
-    ComponentAddedEvent,
-    ComponentMovedEvent,
-    ComponentDeletedEvent,
-    WireAddedEvent,
-    WireDeletedEvent,
-    AnnotationAddedEvent,
-    AnnotationDeletedEvent,
-]
+CircuitEvent = (
+    ComponentAddedEvent
+    | ComponentMovedEvent
+    | ComponentDeletedEvent
+    | WireAddedEvent
+    | WireDeletedEvent
+    | AnnotationAddedEvent
+    | AnnotationDeletedEvent
+)
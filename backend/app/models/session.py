@@ -1,19 +1,19 @@
 """Session and participant Pydantic models."""
 
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 from pydantic import BaseModel, Field, field_validator
 
 
-class Role(str, Enum):
+class Role(StrEnum):
     """Participant role."""
 
     TEACHER = "teacher"
     STUDENT = "student"
 
 
-class EditRequestStatus(str, Enum):
+class EditRequestStatus(StrEnum):
     """Edit request status."""
 
     PENDING = "pending"
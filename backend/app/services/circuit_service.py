@@ -56,7 +56,7 @@ class CircuitService:
     async def get_circuit_state(self, session_code: str) -> CircuitState:
         """
         Reconstruct circuit state from events.
-        
+
         Uses snapshots for efficiency when available.
         """
         # Try to get latest snapshot
@@ -79,6 +79,10 @@ class CircuitService:
 
         return state
 
+    async def get_latest_version(self, session_code: str) -> int:
+        """Get the current circuit version without replaying events."""
+        return await self._event_repo.get_latest_version(session_code)
+
     async def add_component(
         self,
         session_code: str,
@@ -144,7 +148,7 @@ class CircuitService:
     ) -> tuple[list[CircuitEvent], CircuitState]:
         """
         Delete a component and all connected wires (cascade delete).
-        
+
         Returns list of events (component delete + wire deletes).
         """
         state = await self.get_circuit_state(session_code)
@@ -201,7 +205,7 @@ class CircuitService:
     ) -> tuple[CircuitEvent, CircuitState]:
         """
         Add a wire connection between components.
-        
+
         Validates that wire connects output pin to input pin.
         """
         state = await self.get_circuit_state(session_code)
@@ -315,7 +319,7 @@ class CircuitService:
     ) -> tuple[CircuitEvent, CircuitState] | None:
         """
         Undo the last action by this user.
-        
+
         Returns the inverse event and new state, or None if nothing to undo.
         """
         undo_stack = self._undo_stacks[session_code][user_id]
@@ -327,7 +331,7 @@ class CircuitService:
 
         # Create inverse event
         inverse_event = await self._create_inverse_event(
-            session_code, user_id, last_event, state
+            session_code, user_id, last_event
         )
 
         if inverse_event:
@@ -345,7 +349,7 @@ class CircuitService:
     ) -> tuple[CircuitEvent, CircuitState] | None:
         """
         Redo the last undone action by this user.
-        
+
         Returns the re-applied event and new state, or None if nothing to redo.
         """
         redo_stack = self._redo_stacks[session_code][user_id]
@@ -521,7 +525,6 @@ class CircuitService:
         session_code: str,
         user_id: str,
         event: CircuitEvent,
-        state: CircuitState,
     ) -> CircuitEvent | None:
         """Create an inverse event for undo."""
         version = await self._get_next_version(session_code)
@@ -572,12 +575,12 @@ class CircuitService:
                         prev_position = Position.model_validate(
                             e["payload"]["component"]["position"]
                         )
-                elif e.get("type") == CircuitEventType.COMPONENT_MOVED:
-                    if (
-                        e.get("payload", {}).get("componentId")
-                        == event.payload.component_id
-                    ):
-                        prev_position = Position.model_validate(e["payload"]["position"])
+                elif (
+                    e.get("type") == CircuitEventType.COMPONENT_MOVED
+                    and e.get("payload", {}).get("componentId")
+                    == event.payload.component_id
+                ):
+                    prev_position = Position.model_validate(e["payload"]["position"])
 
             if prev_position:
                 return ComponentMovedEvent(
@@ -126,7 +126,7 @@ class CourseService:
         bridge_token: str | None = None,
     ) -> CoursePlan:
         """Generate a new course plan for the given topic using user's API key.
-        
+
         Args:
             topic: The course topic
             participant_id: Optional participant ID
@@ -41,13 +41,13 @@ class LLMProviderFactory:
     @classmethod
     def get_provider(cls, provider_id: str) -> LLMProviderStrategy:
         """Get provider strategy by ID.
-        
+
         Args:
             provider_id: The provider identifier (e.g., 'openai', 'anthropic')
-            
+
         Returns:
             LLMProviderStrategy instance for the provider
-            
+
         Raises:
             ValueError: If provider_id is not supported
         """
@@ -1,5 +1,6 @@
 """LLM Provider strategies for multi-provider support."""
 
+import contextlib
 import json
 import logging
 import re
@@ -142,7 +143,7 @@ class OpenAICompatibleStrategy(LLMProviderStrategy):
             "messages": request.messages,
             "temperature": request.temperature,
         }
-        
+
         # Use max_completion_tokens for newer OpenAI models, max_tokens for others
         if self.provider_id == "openai":
             payload["max_completion_tokens"] = request.max_tokens
@@ -211,7 +212,7 @@ class OpenAICompatibleStrategy(LLMProviderStrategy):
                             except json.JSONDecodeError:
                                 logger.warning(f"Failed to parse JSON from response: {json_match.group()[:200]}")
                         else:
-                            logger.warning(f"No JSON found in response")
+                            logger.warning("No JSON found in response")
 
                 return LLMResponse(
                     content=content,
@@ -224,13 +225,13 @@ class OpenAICompatibleStrategy(LLMProviderStrategy):
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error from {self.provider_id}: {e}")
             if e.response.status_code == 401:
-                raise AuthenticationError(self.provider_id)
+                raise AuthenticationError(self.provider_id) from e
             elif e.response.status_code == 429:
-                raise RateLimitError(self.provider_id)
-            raise ProviderUnavailableError(self.provider_id)
+                raise RateLimitError(self.provider_id) from e
+            raise ProviderUnavailableError(self.provider_id) from e
         except httpx.RequestError as e:
             logger.error(f"Request error to {self.provider_id}: {e}")
-            raise ProviderUnavailableError(self.provider_id)
+            raise ProviderUnavailableError(self.provider_id) from e
 
 
 # --- Anthropic Strategy ---
@@ -358,10 +359,8 @@ class AnthropicStrategy(LLMProviderStrategy):
                         except json.JSONDecodeError:
                             json_match = re.search(r'\{[\s\S]*\}', raw_content)
                             if json_match:
-                                try:
+                                with contextlib.suppress(json.JSONDecodeError):
                                     content = json.loads(json_match.group())
-                                except json.JSONDecodeError:
-                                    pass
                     elif block.get("type") == "tool_use":
                         # Convert to OpenAI tool_call format for consistency
                         tool_calls.append({
@@ -387,13 +386,13 @@ class AnthropicStrategy(LLMProviderStrategy):
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error from Anthropic: {e}")
             if e.response.status_code == 401:
-                raise AuthenticationError(self.provider_id)
+                raise AuthenticationError(self.provider_id) from e
             elif e.response.status_code == 429:
-                raise RateLimitError(self.provider_id)
-            raise ProviderUnavailableError(self.provider_id)
+                raise RateLimitError(self.provider_id) from e
+            raise ProviderUnavailableError(self.provider_id) from e
         except httpx.RequestError as e:
             logger.error(f"Request error to Anthropic: {e}")
-            raise ProviderUnavailableError(self.provider_id)
+            raise ProviderUnavailableError(self.provider_id) from e
 
 
 # --- Google Strategy ---
@@ -525,10 +524,8 @@ class GoogleStrategy(LLMProviderStrategy):
                             except json.JSONDecodeError:
                                 json_match = re.search(r'\{[\s\S]*\}', raw_content)
                                 if json_match:
-                                    try:
+                                    with contextlib.suppress(json.JSONDecodeError):
                                         content = json.loads(json_match.group())
-                                    except json.JSONDecodeError:
-                                        pass
                         elif "functionCall" in part:
                             fc = part["functionCall"]
                             tool_calls.append({
@@ -559,13 +556,13 @@ class GoogleStrategy(LLMProviderStrategy):
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error from Google: {e}")
             if e.response.status_code in (401, 403):
-                raise AuthenticationError(self.provider_id)
+                raise AuthenticationError(self.provider_id) from e
             elif e.response.status_code == 429:
-                raise RateLimitError(self.provider_id)
-            raise ProviderUnavailableError(self.provider_id)
+                raise RateLimitError(self.provider_id) from e
+            raise ProviderUnavailableError(self.provider_id) from e
         except httpx.RequestError as e:
             logger.error(f"Request error to Google: {e}")
-            raise ProviderUnavailableError(self.provider_id)
+            raise ProviderUnavailableError(self.provider_id) from e
 
 
 # --- Local LLM Strategy ---
@@ -575,13 +572,13 @@ class LocalLLMStrategy(LLMProviderStrategy):
 
     provider_id = "local"
 
-    def validate_key_format(self, api_key: str) -> tuple[bool, str]:
+    def validate_key_format(self, api_key: str) -> tuple[bool, str]:  # noqa: ARG002
         """Local provider doesn't use API keys in the traditional sense."""
         return True, ""
 
     async def call(
         self,
-        api_key: str,  # Not used for local, but required by interface
+        api_key: str,  # noqa: ARG002 - required by the interface
         request: LLMRequest,
         base_url: str | None = None,
         bridge_token: str | None = None,
@@ -702,10 +699,8 @@ class LocalLLMStrategy(LLMProviderStrategy):
             except json.JSONDecodeError:
                 json_match = re.search(r'\{[\s\S]*\}', raw_content)
                 if json_match:
-                    try:
+                    with contextlib.suppress(json.JSONDecodeError):
                         content = json.loads(json_match.group())
-                    except json.JSONDecodeError:
-                        pass
 
         return LLMResponse(
             content=content,
@@ -742,10 +737,8 @@ class LocalLLMStrategy(LLMProviderStrategy):
             except json.JSONDecodeError:
                 json_match = re.search(r'\{[\s\S]*\}', raw_content)
                 if json_match:
-                    try:
+                    with contextlib.suppress(json.JSONDecodeError):
                         content = json.loads(json_match.group())
-                    except json.JSONDecodeError:
-                        pass
 
         # Ollama provides different token metrics
         token_usage = result.get("eval_count", 0) + result.get("prompt_eval_count", 0)
@@ -794,11 +787,6 @@ class LocalLLMStrategy(LLMProviderStrategy):
         model: str,
     ) -> dict[str, Any]:
         """Test connection to local LLM."""
-        headers = {
-            "Content-Type": "application/json",
-            "X-Bridge-Token": bridge_token,
-        }
-
         # Simple test request
         test_request = LLMRequest(
             messages=[{"role": "user", "content": "Say OK"}],
@@ -809,7 +797,7 @@ class LocalLLMStrategy(LLMProviderStrategy):
         )
 
         try:
-            response = await self.call(
+            await self.call(
                 api_key="",
                 request=test_request,
                 base_url=base_url,
@@ -322,14 +322,14 @@ class LLMService:
                     }
                 else:
                     # Model returned empty/non-JSON content, try fallback
-                    logger.warning(f"Model returned no parseable JSON content, trying fallback mode")
+                    logger.warning("Model returned no parseable JSON content, trying fallback mode")
                     return await self._call_fallback(
                         provider, api_key, system_prompt, user_prompt, model, temperature, max_tokens,
                         base_url=base_url, bridge_token=bridge_token,
                     )
 
         # If we exhausted tool calls without getting content, try fallback
-        logger.warning(f"Exceeded max tool calls without valid content, trying fallback mode")
+        logger.warning("Exceeded max tool calls without valid content, trying fallback mode")
         return await self._call_fallback(
             provider, api_key, system_prompt, user_prompt, model, temperature, max_tokens,
             base_url=base_url, bridge_token=bridge_token,
@@ -394,7 +394,7 @@ Do NOT use markdown code blocks. Start your response with { and end with }.
             response = await provider.call(api_key, request, base_url=base_url, bridge_token=bridge_token)
         else:
             response = await provider.call(api_key, request)
-        
+
         # If content is still None, try to parse raw_content more aggressively
         if response.content is None and response.raw_content:
             logger.warning("Fallback: Attempting aggressive JSON extraction from raw content")
@@ -491,7 +491,7 @@ Do NOT use markdown code blocks. Start your response with { and end with }.
                 if match:
                     label, pin = match.groups()
                     floating_inputs.append((label, pin))
-        
+
         # Add CONST_LOW for each floating input
         const_count = sum(1 for c in fixed["components"] if c.get("type") == "CONST_LOW")
         for i, (label, pin) in enumerate(floating_inputs):
@@ -561,7 +561,7 @@ Do NOT use markdown code blocks. Start your response with { and end with }.
         # Validate response content
         if not content:
             raise ValueError("LLM returned empty response. Please try again or use a different model.")
-        
+
         if "levels" not in content or not content["levels"]:
             raise ValueError(f"LLM response missing 'levels' field. Got: {list(content.keys()) if content else 'None'}")
 
@@ -620,7 +620,7 @@ Do NOT use markdown code blocks. Start your response with { and end with }.
 
         # Find the level outline
         level_outline = next(
-            (l for l in course_plan.levels if l.level_number == level_number),
+            (lvl for lvl in course_plan.levels if lvl.level_number == level_number),
             None,
         )
         if not level_outline:
@@ -628,9 +628,9 @@ Do NOT use markdown code blocks. Start your response with { and end with }.
 
         # Get previous levels summary
         previous_levels = [
-            f"Level {l.level_number}: {l.title}"
-            for l in course_plan.levels
-            if l.level_number < level_number
+            f"Level {lvl.level_number}: {lvl.title}"
+            for lvl in course_plan.levels
+            if lvl.level_number < level_number
         ]
 
         system_prompt = LEVEL_CONTENT_SYSTEM_PROMPT.format(
@@ -130,7 +130,7 @@ class ToolHandler:
         """Store circuit state for a session."""
         self._circuit_states[session_id] = state
 
-    def _handle_get_components(self, args: dict[str, Any]) -> dict[str, Any]:
+    def _handle_get_components(self, args: dict[str, Any]) -> dict[str, Any]:  # noqa: ARG002
         """Return all components grouped by category."""
         components = self.registry.get_all_components()
         return {
@@ -194,11 +194,11 @@ class ToolHandler:
 
         components = blueprint.get("components", [])
         wires = blueprint.get("wires", [])
-        
+
         if not components:
             errors.append("Blueprint has no components")
             return {"success": False, "errors": errors, "warnings": warnings}
-        
+
         if not wires:
             errors.append("Blueprint has no wires - components must be connected")
             return {"success": False, "errors": errors, "warnings": warnings}
@@ -316,22 +316,20 @@ class ToolHandler:
 
         # Check for floating inputs (input pins with no connection)
         # This is CRITICAL - all input pins must be connected for a complete circuit
-        input_types = {"SWITCH_TOGGLE", "SWITCH_PUSH", "CLOCK", "CONST_HIGH", "CONST_LOW", 
+        input_types = {"SWITCH_TOGGLE", "SWITCH_PUSH", "CLOCK", "CONST_HIGH", "CONST_LOW",
                        "DIP_SWITCH_4", "NUMERIC_INPUT", "VCC_5V", "VCC_3V3"}
-        output_types = {"LED_RED", "LED_GREEN", "LED_YELLOW", "LED_BLUE", "DISPLAY_7SEG", 
-                        "BUZZER", "MOTOR_DC", "PROBE", "GROUND"}
-        
+
         for label, comp_info in labels.items():
             comp_def = comp_info.get("definition")
             comp_type = comp_info.get("type", "")
-            
+
             if not comp_def:
                 continue
-                
+
             # Skip input devices (they don't have input pins that need connecting)
             if comp_type in input_types:
                 continue
-            
+
             # Check each input pin has a connection
             for pin in comp_def.pins:
                 if pin.type == "input":
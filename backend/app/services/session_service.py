@@ -41,7 +41,7 @@ class SessionService:
     async def create_session(self) -> tuple[Session, str]:
         """
         Create a new collaborative session.
-        
+
         Returns:
             Tuple of (Session, participant_id for the creator)
         """
@@ -86,12 +86,12 @@ class SessionService:
     ) -> Participant:
         """
         Join an existing session.
-        
+
         Args:
             code: Session code
             display_name: User's display name
             participant_id: Optional existing participant ID for rejoin
-            
+
         Returns:
             Participant object
         """
@@ -197,7 +197,7 @@ class SessionService:
     async def cleanup_inactive_sessions(self) -> int:
         """
         Delete sessions that have been inactive for more than 24 hours.
-        
+
         Returns:
             Number of sessions deleted
         """
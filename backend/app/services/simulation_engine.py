@@ -3,12 +3,13 @@
 import heapq
 from collections.abc import Callable
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import StrEnum
+from typing import Any
 
 from app.models.circuit import CircuitComponent, CircuitState, Wire
 
 
-class Signal(str, Enum):
+class Signal(StrEnum):
     """Signal values for circuit simulation."""
     HIGH = "1"
     LOW = "0"
@@ -46,11 +47,17 @@ class SimulationEngine:
         self.pin_values: dict[str, Signal] = {}  # "comp:pin" -> value
         self.connections: dict[str, list[str]] = {}  # "from_comp:from_pin" -> ["to_comp:to_pin", ...]
         self.listeners: dict[str, Callable] = {}  # Callbacks for state changes
+        self.wire_ids: list[str] = []
+        self.wire_sources: list[str] = []  # "from_comp:from_pin" per wire
 
     def load_circuit(self, circuit: CircuitState) -> None:
         """Load a circuit for simulation."""
         self.components = {c.id: c for c in circuit.components}
         self.wires = circuit.wires
+        self.wire_ids = [wire.id for wire in self.wires]
+        self.wire_sources = [
+            f"{wire.from_component_id}:{wire.from_pin_id}" for wire in self.wires
+        ]
         self.states = {c.id: ComponentState() for c in circuit.components}
         self.pin_values = {}
         self.connections = {}
@@ -373,6 +380,18 @@ class SimulationEngine:
             result[wire.id] = self.pin_values.get(from_key, Signal.X).value
         return result
 
+    def get_wire_states_compact(self) -> dict[str, Any]:
+        """
+        Get all wire states as parallel arrays for frontend.
+
+        ``states`` holds one signal character per wire, in ``ids`` order.
+        """
+        pin_values = self.pin_values
+        states = "".join(
+            pin_values.get(source, Signal.X).value for source in self.wire_sources
+        )
+        return {"ids": self.wire_ids, "states": states}
+
     def get_pin_states(self) -> dict[str, dict[str, str]]:
         """Get all pin states grouped by component."""
         result = {}
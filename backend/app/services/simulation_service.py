@@ -1,17 +1,43 @@
 """Circuit simulation service with logic gate evaluation."""
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
+from typing import Any
 
-from app.models.circuit import CircuitComponent, CircuitState, ComponentType, Wire
+from app.models.circuit import (
+    CircuitComponent,
+    CircuitState,
+    ComponentType,
+    Pin,
+    PinType,
+    Wire,
+)
 
 
-class SignalState(str, Enum):
-    """Signal state on a wire."""
-    HIGH = "HIGH"
-    LOW = "LOW"
-    UNDEFINED = "UNDEFINED"
-    ERROR = "ERROR"
+class SignalState(IntEnum):
+    """Signal state on a wire.
+
+    Integer-backed so hot-path comparisons and hashing stay cheap; use
+    _STATE_NAMES to convert to the string form sent to clients.
+    """
+    LOW = 0
+    HIGH = 1
+    UNDEFINED = 2
+    ERROR = 3
+
+
+# Wire-format names indexed by SignalState value
+_STATE_NAMES: tuple[str, ...] = tuple(state.name for state in SignalState)
+
+# Structural fingerprint of a circuit: (component id, type, (pin id, pin name,
+# pin type) per pin) per component, then (id, from component, from pin, to
+# component, to pin) per wire. Pin names are included because the cached
+# validation errors quote them.
+TopologySignature = tuple[
+    tuple[tuple[str, ComponentType, tuple[tuple[str, str, PinType], ...]], ...],
+    tuple[tuple[str, str, str, str, str], ...],
+]
 
 
 @dataclass
@@ -23,6 +49,24 @@ class SimulationError:
     pin_id: str | None = None
 
 
+@dataclass
+class _CachedTopology:
+    """Structure-derived simulation data, valid until the topology changes."""
+    signature: TopologySignature
+    eval_order: list[str] = field(default_factory=list)
+    errors: list[SimulationError] = field(default_factory=list)
+
+
+class CycleDetectedError(ValueError):
+    """Raised when the circuit graph contains one or more feedback loops."""
+
+    def __init__(self, cycles: list[list[str]]):
+        self.cycles = cycles
+        super().__init__(
+            f"Circuit contains {len(cycles)} cycle(s) - cannot simulate"
+        )
+
+
 @dataclass
 class SimulationResult:
     """Result of circuit simulation."""
@@ -31,6 +75,38 @@ class SimulationResult:
     pin_states: dict[str, dict[str, SignalState]] = field(default_factory=dict)
     errors: list[SimulationError] = field(default_factory=list)
 
+    def copy(self) -> "SimulationResult":
+        """Return a snapshot that is not affected by later simulation runs."""
+        return SimulationResult(
+            success=self.success,
+            wire_states=dict(self.wire_states),
+            pin_states={cid: dict(pins) for cid, pins in self.pin_states.items()},
+            errors=list(self.errors),
+        )
+
+    def to_payload(self) -> dict[str, Any]:
+        """Convert to the JSON payload shape used in WebSocket messages."""
+        return {
+            "success": self.success,
+            "wireStates": {
+                wire_id: _STATE_NAMES[state]
+                for wire_id, state in self.wire_states.items()
+            },
+            "pinStates": {
+                comp_id: {pin_id: _STATE_NAMES[state] for pin_id, state in pins.items()}
+                for comp_id, pins in self.pin_states.items()
+            },
+            "errors": [
+                {
+                    "errorType": error.error_type,
+                    "message": error.message,
+                    "componentId": error.component_id,
+                    "pinId": error.pin_id,
+                }
+                for error in self.errors
+            ],
+        }
+
 
 class LogicGate:
     """Base class for logic gate evaluation."""
@@ -91,6 +167,24 @@ class LogicGate:
         return input_signal
 
 
+def _first_input(inputs: list[SignalState]) -> SignalState:
+    """Return the first input signal, or UNDEFINED when there is none."""
+    return inputs[0] if inputs else SignalState.UNDEFINED
+
+
+# Gate evaluators indexed by SimulationService.GATE_FAMILY ids
+_GATE_FNS: tuple[Callable[[list[SignalState]], SignalState], ...] = (
+    LogicGate.evaluate_and,
+    LogicGate.evaluate_or,
+    lambda inputs: LogicGate.evaluate_not(_first_input(inputs)),
+    lambda inputs: LogicGate.evaluate_buffer(_first_input(inputs)),
+    LogicGate.evaluate_nand,
+    LogicGate.evaluate_nor,
+    LogicGate.evaluate_xor,
+    LogicGate.evaluate_xnor,
+)
+
+
 class SimulationService:
     """Service for simulating circuit logic."""
 
@@ -104,6 +198,18 @@ class SimulationService:
         ComponentType.XOR_2, ComponentType.XNOR_2,
     }
 
+    # Logic gate type -> index into _GATE_FNS
+    GATE_FAMILY: dict[ComponentType, int] = {
+        ComponentType.AND_2: 0, ComponentType.AND_3: 0, ComponentType.AND_4: 0,
+        ComponentType.OR_2: 1, ComponentType.OR_3: 1, ComponentType.OR_4: 1,
+        ComponentType.NOT: 2,
+        ComponentType.BUFFER: 3,
+        ComponentType.NAND_2: 4, ComponentType.NAND_3: 4,
+        ComponentType.NOR_2: 5, ComponentType.NOR_3: 5,
+        ComponentType.XOR_2: 6,
+        ComponentType.XNOR_2: 7,
+    }
+
     # Input devices that produce signals
     INPUT_DEVICES = {
         ComponentType.SWITCH_TOGGLE, ComponentType.SWITCH_PUSH,
@@ -124,69 +230,221 @@ class SimulationService:
         self._component_map: dict[str, CircuitComponent] = {}
         self._wire_map: dict[str, Wire] = {}
         self._adjacency: dict[str, list[str]] = {}  # component_id -> connected component_ids
-        self._pin_connections: dict[tuple[str, str], list[tuple[str, str]]] = {}  # (comp_id, pin_id) -> [(comp_id, pin_id)]
+        # Every (comp_id, pin_id) gets a dense slot in self._signals; slot 0 is
+        # reserved as a permanently UNDEFINED source for undriven inputs.
+        self._slot_of: dict[tuple[str, str], int] = {}
+        self._signals: list[SignalState] = [SignalState.UNDEFINED]
+        self._input_pins: dict[str, tuple[Pin, ...]] = {}  # component_id -> input pins
+        self._output_pins: dict[str, tuple[Pin, ...]] = {}  # component_id -> output pins
+        self._input_slots: dict[str, list[int]] = {}  # component_id -> input pin slots
+        self._output_slots: dict[str, list[int]] = {}  # component_id -> output pin slots
+        self._input_driver: dict[int, int] = {}  # input slot -> driving output slot
+        self._driver_slots: dict[str, list[int]] = {}  # component_id -> driver slot per input pin
+        self._reported_pins: dict[str, list[tuple[str, int]]] = {}  # component_id -> pins exposed in pin_states
+        self._wire_slots: dict[str, int] = {}  # wire_id -> driving output slot
+        self._outgoing_wires: dict[str, list[str]] = {}  # component_id -> ids of wires it drives
+        self._eval_order: list[str] = []
+        self._downstream_closure: dict[str, list[str]] = {}  # input device id -> affected ids in eval order
+        self._last_result: SimulationResult | None = None
+        # State buffers reused across runs while the circuit topology is unchanged
+        self._cached_topo: _CachedTopology | None = None
+        self._pin_states_buf: dict[str, dict[str, SignalState]] = {}
+        self._wire_states_buf: dict[str, SignalState] = {}
 
     def simulate(self, circuit: CircuitState) -> SimulationResult:
         """
         Simulate the circuit and compute signal states.
-        
+
+        While the circuit topology is unchanged between calls, the returned
+        state dicts are reused buffers that the next simulation overwrites in
+        place; call SimulationResult.copy() to keep an immutable snapshot.
+
         Args:
             circuit: The circuit state to simulate
-            
+
         Returns:
             SimulationResult with wire states and any errors
         """
-        self._build_graph(circuit)
+        topology = self._topology_signature(circuit)
+        self._last_result = None
+
+        cached = self._cached_topo
+        if cached is not None and cached.signature == topology:
+            # Structure unchanged - validation and ordering are still valid
+            self._component_map = {c.id: c for c in circuit.components}
+            pin_states = self._pin_states_buf
+            wire_states = self._wire_states_buf
+        else:
+            self._build_graph(circuit)
+            cached = self._analyze_topology(circuit, topology)
+            self._cached_topo = cached
+            pin_states = self._pin_states_buf = {}
+            wire_states = self._wire_states_buf = {}
 
-        errors: list[SimulationError] = []
-        pin_states: dict[str, dict[str, SignalState]] = {}
-        wire_states: dict[str, SignalState] = {}
+        if cached.errors:
+            return SimulationResult(success=False, errors=list(cached.errors))
 
-        # Check for floating inputs and output conflicts
-        validation_errors = self._validate_circuit(circuit)
-        if validation_errors:
-            return SimulationResult(
-                success=False,
-                errors=validation_errors
-            )
-
-        # Get topological order for evaluation
-        try:
-            eval_order = self._topological_sort(circuit)
-        except ValueError as e:
-            errors.append(SimulationError(
-                error_type="CYCLE_DETECTED",
-                message=str(e)
-            ))
-            return SimulationResult(success=False, errors=errors)
+        # Every slot read below is rewritten each run, so the signal array
+        # can be reused as-is for an unchanged topology.
+        signals = self._signals
 
         # Initialize input device states
         for comp in circuit.components:
-            pin_states[comp.id] = {}
             if comp.type in self.INPUT_DEVICES:
-                self._initialize_input_device(comp, pin_states)
+                self._initialize_input_device(comp, signals)
 
         # Evaluate components in topological order
-        for comp_id in eval_order:
-            comp = self._component_map.get(comp_id)
-            if not comp:
-                continue
+        for comp_id in cached.eval_order:
+            self._evaluate_component(comp_id, signals)
 
-            if comp.type in self.LOGIC_GATES:
-                self._evaluate_gate(comp, pin_states)
-            elif comp.type in self.OUTPUT_DEVICES:
-                self._evaluate_output_device(comp, pin_states)
+        # Expand slots into the nested pin/wire state dicts at the API boundary
+        for comp_id in self._component_map:
+            self._collect_pin_states(comp_id, pin_states)
+        for wire_id, slot in self._wire_slots.items():
+            wire_states[wire_id] = signals[slot]
 
-        # Compute wire states from pin states
-        for wire in circuit.wires:
-            from_state = pin_states.get(wire.from_component_id, {}).get(wire.from_pin_id, SignalState.UNDEFINED)
-            wire_states[wire.id] = from_state
+        self._last_result = SimulationResult(
+            success=True,
+            wire_states=wire_states,
+            pin_states=pin_states,
+        )
+        return self._last_result
 
-        return SimulationResult(
+    def simulate_delta(
+        self, circuit: CircuitState, changed_input_ids: list[str]
+    ) -> SimulationResult:
+        """
+        Re-simulate only the components downstream of changed input devices.
+
+        The circuit must have the same topology as the one passed to the last
+        successful simulate() call; only input device properties (switch state,
+        clock phase, ...) may differ. Falls back to a full simulation when there
+        is no previous result or an ID is not a known input device.
+
+        Args:
+            circuit: The circuit state with updated input device properties
+            changed_input_ids: IDs of the input devices whose state changed
+
+        Returns:
+            SimulationResult with wire states and any errors
+        """
+        previous = self._last_result
+        if previous is None or any(
+            cid not in self._downstream_closure for cid in changed_input_ids
+        ):
+            return self.simulate(circuit)
+
+        self._component_map = {c.id: c for c in circuit.components}
+        signals = self._signals
+        pin_states = previous.pin_states
+        wire_states = previous.wire_states
+
+        affected: set[str] = set(changed_input_ids)
+        for comp_id in changed_input_ids:
+            self._initialize_input_device(self._component_map[comp_id], signals)
+            affected.update(self._downstream_closure[comp_id])
+
+        if len(changed_input_ids) == 1:
+            cone = self._downstream_closure[changed_input_ids[0]]
+        else:
+            cone = [cid for cid in self._eval_order if cid in affected]
+
+        for comp_id in cone:
+            self._evaluate_component(comp_id, signals)
+
+        for comp_id in affected:
+            self._collect_pin_states(comp_id, pin_states)
+            for wire_id in self._outgoing_wires.get(comp_id, []):
+                wire_states[wire_id] = signals[self._wire_slots[wire_id]]
+
+        self._last_result = SimulationResult(
             success=True,
             wire_states=wire_states,
             pin_states=pin_states,
-            errors=errors
+        )
+        return self._last_result
+
+    def _evaluate_component(self, comp_id: str, signals: list[SignalState]) -> None:
+        """Evaluate a single component if it is a gate or output device."""
+        comp = self._component_map.get(comp_id)
+        if not comp:
+            return
+
+        if comp.type in self.LOGIC_GATES:
+            self._evaluate_gate(comp, signals)
+        elif comp.type in self.OUTPUT_DEVICES:
+            self._evaluate_output_device(comp, signals)
+
+    def _collect_pin_states(
+        self,
+        comp_id: str,
+        pin_states: dict[str, dict[str, SignalState]]
+    ) -> None:
+        """Copy a component's reported pin slots into the nested pin state dict."""
+        signals = self._signals
+        states = pin_states.setdefault(comp_id, {})
+        for pin_id, slot in self._reported_pins.get(comp_id, ()):
+            states[pin_id] = signals[slot]
+
+    def _build_downstream_closure(self) -> None:
+        """Record, for every input device, the components it can reach in eval order."""
+        topo_index = {cid: i for i, cid in enumerate(self._eval_order)}
+        self._downstream_closure = {}
+
+        for comp_id, comp in self._component_map.items():
+            if comp.type not in self.INPUT_DEVICES:
+                continue
+
+            reached: set[str] = set()
+            frontier = list(self._adjacency.get(comp_id, []))
+            while frontier:
+                current = frontier.pop()
+                if current in reached or current not in topo_index:
+                    continue
+                reached.add(current)
+                frontier.extend(self._adjacency.get(current, []))
+
+            self._downstream_closure[comp_id] = sorted(reached, key=topo_index.__getitem__)
+
+    def _analyze_topology(
+        self, circuit: CircuitState, signature: TopologySignature
+    ) -> _CachedTopology:
+        """Validate the circuit and compute its evaluation order."""
+        # Check for floating inputs and output conflicts
+        validation_errors = self._validate_circuit(circuit)
+        if validation_errors:
+            return _CachedTopology(signature=signature, errors=validation_errors)
+
+        # Get topological order for evaluation
+        try:
+            eval_order = self._topological_sort(circuit)
+        except CycleDetectedError as e:
+            errors = [
+                SimulationError(
+                    error_type="CYCLE_DETECTED",
+                    message=f"Cycle Detected: components {', '.join(cycle)} form a feedback loop",
+                    component_id=cycle[0]
+                )
+                for cycle in e.cycles
+            ]
+            return _CachedTopology(signature=signature, errors=errors)
+
+        self._eval_order = eval_order
+        self._build_downstream_closure()
+        return _CachedTopology(signature=signature, eval_order=eval_order)
+
+    @staticmethod
+    def _topology_signature(circuit: CircuitState) -> TopologySignature:
+        """Structural fingerprint of a circuit, ignoring positions and properties."""
+        return (
+            tuple(
+                (c.id, c.type, tuple((p.id, p.name, p.type) for p in c.pins))
+                for c in circuit.components
+            ),
+            tuple(
+                (w.id, w.from_component_id, w.from_pin_id, w.to_component_id, w.to_pin_id)
+                for w in circuit.wires
+            ),
         )
 
     def _build_graph(self, circuit: CircuitState) -> None:
@@ -194,226 +452,246 @@ class SimulationService:
         self._component_map = {c.id: c for c in circuit.components}
         self._wire_map = {w.id: w for w in circuit.wires}
         self._adjacency = {c.id: [] for c in circuit.components}
-        self._pin_connections = {}
+        self._slot_of = {}
+        self._input_pins = {}
+        self._output_pins = {}
+        self._input_slots = {}
+        self._output_slots = {}
+        self._input_driver = {}
+        self._reported_pins = {}
+        self._wire_slots = {}
+        self._outgoing_wires = {}
+
+        # Assign dense signal slots to every component pin
+        for comp in circuit.components:
+            # Input devices and gates report their outputs; output devices their inputs
+            reports_inputs = comp.type in self.OUTPUT_DEVICES
+            reports_outputs = comp.type in self.INPUT_DEVICES or comp.type in self.LOGIC_GATES
+            input_pins = tuple(p for p in comp.pins if p.type is PinType.INPUT)
+            output_pins = tuple(p for p in comp.pins if p.type is PinType.OUTPUT)
+            self._input_pins[comp.id] = input_pins
+            self._output_pins[comp.id] = output_pins
+
+            inputs = [self._assign_slot(comp.id, pin.id) for pin in input_pins]
+            outputs = [self._assign_slot(comp.id, pin.id) for pin in output_pins]
+            self._input_slots[comp.id] = inputs
+            self._output_slots[comp.id] = outputs
+
+            reported: list[tuple[str, int]] = []
+            if reports_inputs:
+                reported = [(pin.id, slot) for pin, slot in zip(input_pins, inputs, strict=True)]
+            elif reports_outputs:
+                reported = [(pin.id, slot) for pin, slot in zip(output_pins, outputs, strict=True)]
+            self._reported_pins[comp.id] = reported
+
+        self._signals = [SignalState.UNDEFINED] * (len(self._slot_of) + 1)
 
         for wire in circuit.wires:
-            # Add adjacency (from -> to) - avoid duplicates
-            if wire.from_component_id in self._adjacency:
-                if wire.to_component_id not in self._adjacency[wire.from_component_id]:
-                    self._adjacency[wire.from_component_id].append(wire.to_component_id)
+            self._outgoing_wires.setdefault(wire.from_component_id, []).append(wire.id)
 
-            # Track pin connections
-            from_key = (wire.from_component_id, wire.from_pin_id)
-            to_key = (wire.to_component_id, wire.to_pin_id)
-
-            if from_key not in self._pin_connections:
-                self._pin_connections[from_key] = []
-            self._pin_connections[from_key].append(to_key)
+            # Add adjacency (from -> to) - avoid duplicates
+            if (
+                wire.from_component_id in self._adjacency
+                and wire.to_component_id not in self._adjacency[wire.from_component_id]
+            ):
+                self._adjacency[wire.from_component_id].append(wire.to_component_id)
+
+            # Map the driven input slot to its source output slot
+            from_slot = self._slot_of.get((wire.from_component_id, wire.from_pin_id), 0)
+            to_slot = self._slot_of.get((wire.to_component_id, wire.to_pin_id))
+            if to_slot is not None:
+                self._input_driver[to_slot] = from_slot
+            self._wire_slots[wire.id] = from_slot
+
+        self._driver_slots = {
+            comp_id: [self._input_driver.get(slot, 0) for slot in slots]
+            for comp_id, slots in self._input_slots.items()
+        }
+
+    def _assign_slot(self, comp_id: str, pin_id: str) -> int:
+        """Return the signal slot for a pin, allocating a new one if needed."""
+        return self._slot_of.setdefault((comp_id, pin_id), len(self._slot_of) + 1)
 
     def _validate_circuit(self, circuit: CircuitState) -> list[SimulationError]:
         """Validate circuit for common errors."""
         errors: list[SimulationError] = []
 
         # Check for floating inputs (input pins with no connection)
-        connected_inputs: set[tuple[str, str]] = set()
-        output_drivers: dict[tuple[str, str], list[str]] = {}  # input pin -> list of driving outputs
+        output_drivers: dict[tuple[str, str], str] = {}  # input pin -> first driving component
+        conflicts: set[tuple[str, str]] = set()  # input pins with more than one distinct driver
 
         for wire in circuit.wires:
             to_key = (wire.to_component_id, wire.to_pin_id)
-            connected_inputs.add(to_key)
 
             # Track multiple outputs driving same input
-            if to_key not in output_drivers:
-                output_drivers[to_key] = []
-            output_drivers[to_key].append(wire.from_component_id)
+            prev_driver = output_drivers.get(to_key)
+            if prev_driver is None:
+                output_drivers[to_key] = wire.from_component_id
+            elif prev_driver != wire.from_component_id:
+                conflicts.add(to_key)
 
         # Check each component's input pins
         for comp in circuit.components:
             if comp.type in self.INPUT_DEVICES:
                 continue  # Input devices don't need input connections
 
-            for pin in comp.pins:
-                if pin.type.value == "input":
-                    pin_key = (comp.id, pin.id)
-                    if pin_key not in connected_inputs:
-                        errors.append(SimulationError(
-                            error_type="FLOATING_INPUT",
-                            message=f"Floating Input: Input pin '{pin.name}' has no connection",
-                            component_id=comp.id,
-                            pin_id=pin.id
-                        ))
+            for pin in self._input_pins[comp.id]:
+                pin_key = (comp.id, pin.id)
+                if pin_key not in output_drivers:
+                    errors.append(SimulationError(
+                        error_type="FLOATING_INPUT",
+                        message=f"Floating Input: Input pin '{pin.name}' has no connection",
+                        component_id=comp.id,
+                        pin_id=pin.id
+                    ))
 
         # Check for output conflicts (multiple outputs driving same input pin)
-        for pin_key, drivers in output_drivers.items():
-            # Filter out duplicate entries from the same driver (same wire counted multiple times)
-            unique_drivers = list(set(drivers))
-            if len(unique_drivers) > 1:
-                comp_id, pin_id = pin_key
-                comp = self._component_map.get(comp_id)
-                comp_label = comp.label if comp and comp.label else comp_id
-                pin_name = pin_id
-                if comp:
-                    for pin in comp.pins:
-                        if pin.id == pin_id:
-                            pin_name = pin.name
-                            break
-                errors.append(SimulationError(
-                    error_type="OUTPUT_CONFLICT",
-                    message=f"Output Conflict: {comp_label} pin '{pin_name}' has multiple drivers",
-                    component_id=comp_id,
-                    pin_id=pin_id
-                ))
+        for pin_key in conflicts:
+            comp_id, pin_id = pin_key
+            comp = self._component_map.get(comp_id)
+            comp_label = getattr(comp, "label", None) or comp_id
+            pin_name = pin_id
+            if comp:
+                for pin in comp.pins:
+                    if pin.id == pin_id:
+                        pin_name = pin.name
+                        break
+            errors.append(SimulationError(
+                error_type="OUTPUT_CONFLICT",
+                message=f"Output Conflict: {comp_label} pin '{pin_name}' has multiple drivers",
+                component_id=comp_id,
+                pin_id=pin_id
+            ))
 
         return errors
 
     def _topological_sort(self, circuit: CircuitState) -> list[str]:
         """
         Perform topological sort on circuit components.
-        
-        Returns components in order they should be evaluated.
-        Raises ValueError if cycle detected.
-        """
-        in_degree: dict[str, int] = {c.id: 0 for c in circuit.components}
 
-        # Calculate in-degrees based on adjacency list (which has no duplicates)
-        # This ensures in_degree matches the number of times we'll decrement it
-        for from_comp_id, neighbors in self._adjacency.items():
-            for to_comp_id in neighbors:
-                if to_comp_id in in_degree:
-                    in_degree[to_comp_id] += 1
+        Uses an iterative Tarjan's SCC pass so every cycle in the circuit is
+        found in a single traversal. Strongly connected components are emitted
+        in reverse topological order, so reversing them yields the evaluation
+        order when the graph is acyclic.
 
-        # Start with components that have no inputs (in_degree = 0)
-        queue = [cid for cid, deg in in_degree.items() if deg == 0]
+        Returns components in order they should be evaluated.
+        Raises CycleDetectedError listing every cycle if any are found.
+        """
+        index_of: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        on_stack: set[str] = set()
+        scc_stack: list[str] = []
         result: list[str] = []
+        cycles: list[list[str]] = []
 
-        while queue:
-            current = queue.pop(0)
-            result.append(current)
+        for root in (c.id for c in circuit.components):
+            if root in index_of:
+                continue
 
-            for neighbor in self._adjacency.get(current, []):
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
+            index_of[root] = lowlink[root] = len(index_of)
+            scc_stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._adjacency.get(root, [])))]
+
+            while work:
+                node, neighbors = work[-1]
+                descended = False
+                for neighbor in neighbors:
+                    if neighbor not in self._component_map:
+                        continue
+                    if neighbor not in index_of:
+                        index_of[neighbor] = lowlink[neighbor] = len(index_of)
+                        scc_stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(self._adjacency.get(neighbor, []))))
+                        descended = True
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[neighbor])
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index_of[node]:
+                    # Node is the root of an SCC - pop its members
+                    scc: list[str] = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        scc.append(member)
+                        if member == node:
+                            break
+                    if len(scc) > 1 or node in self._adjacency.get(node, []):
+                        cycles.append(scc[::-1])
+                    result.extend(scc)
 
-        if len(result) != len(circuit.components):
-            raise ValueError("Circuit contains a cycle - cannot simulate")
+        if cycles:
+            raise CycleDetectedError(cycles)
 
+        result.reverse()
         return result
 
     def _initialize_input_device(
         self,
         comp: CircuitComponent,
-        pin_states: dict[str, dict[str, SignalState]]
+        signals: list[SignalState]
     ) -> None:
         """Initialize output states for input devices."""
         if comp.type == ComponentType.CONST_HIGH:
-            for pin in comp.pins:
-                if pin.type.value == "output":
-                    pin_states[comp.id][pin.id] = SignalState.HIGH
+            value = SignalState.HIGH
 
         elif comp.type == ComponentType.CONST_LOW:
-            for pin in comp.pins:
-                if pin.type.value == "output":
-                    pin_states[comp.id][pin.id] = SignalState.LOW
+            value = SignalState.LOW
 
         elif comp.type == ComponentType.SWITCH_TOGGLE:
             # Get state from properties, default to LOW
             is_on = comp.properties.get("state", False)
-            for pin in comp.pins:
-                if pin.type.value == "output":
-                    pin_states[comp.id][pin.id] = SignalState.HIGH if is_on else SignalState.LOW
+            value = SignalState.HIGH if is_on else SignalState.LOW
 
         elif comp.type == ComponentType.SWITCH_PUSH:
             # Push buttons are normally LOW
             is_pressed = comp.properties.get("pressed", False)
-            for pin in comp.pins:
-                if pin.type.value == "output":
-                    pin_states[comp.id][pin.id] = SignalState.HIGH if is_pressed else SignalState.LOW
+            value = SignalState.HIGH if is_pressed else SignalState.LOW
 
         elif comp.type == ComponentType.CLOCK:
             # Clock state alternates, use current phase from properties
             phase = comp.properties.get("phase", 0)
-            for pin in comp.pins:
-                if pin.type.value == "output":
-                    pin_states[comp.id][pin.id] = SignalState.HIGH if phase % 2 == 0 else SignalState.LOW
+            value = SignalState.HIGH if phase % 2 == 0 else SignalState.LOW
 
         else:
             # Default: all outputs LOW
-            for pin in comp.pins:
-                if pin.type.value == "output":
-                    pin_states[comp.id][pin.id] = SignalState.LOW
+            value = SignalState.LOW
 
-    def _get_input_signals(
-        self,
-        comp: CircuitComponent,
-        pin_states: dict[str, dict[str, SignalState]]
-    ) -> list[SignalState]:
-        """Get input signal states for a component."""
-        inputs: list[SignalState] = []
-
-        for pin in comp.pins:
-            if pin.type.value == "input":
-                # Find the wire connected to this input
-                signal = SignalState.UNDEFINED
-                for (from_comp, from_pin), connections in self._pin_connections.items():
-                    for to_comp, to_pin in connections:
-                        if to_comp == comp.id and to_pin == pin.id:
-                            signal = pin_states.get(from_comp, {}).get(from_pin, SignalState.UNDEFINED)
-                            break
-                inputs.append(signal)
-
-        return inputs
+        for slot in self._output_slots[comp.id]:
+            signals[slot] = value
 
     def _evaluate_gate(
         self,
         comp: CircuitComponent,
-        pin_states: dict[str, dict[str, SignalState]]
+        signals: list[SignalState]
     ) -> None:
         """Evaluate a logic gate and set its output state."""
-        inputs = self._get_input_signals(comp, pin_states)
-        output = SignalState.UNDEFINED
-
-        if comp.type in {ComponentType.AND_2, ComponentType.AND_3, ComponentType.AND_4}:
-            output = LogicGate.evaluate_and(inputs)
-
-        elif comp.type in {ComponentType.OR_2, ComponentType.OR_3, ComponentType.OR_4}:
-            output = LogicGate.evaluate_or(inputs)
-
-        elif comp.type == ComponentType.NOT:
-            output = LogicGate.evaluate_not(inputs[0] if inputs else SignalState.UNDEFINED)
-
-        elif comp.type == ComponentType.BUFFER:
-            output = LogicGate.evaluate_buffer(inputs[0] if inputs else SignalState.UNDEFINED)
-
-        elif comp.type in {ComponentType.NAND_2, ComponentType.NAND_3}:
-            output = LogicGate.evaluate_nand(inputs)
-
-        elif comp.type in {ComponentType.NOR_2, ComponentType.NOR_3}:
-            output = LogicGate.evaluate_nor(inputs)
-
-        elif comp.type == ComponentType.XOR_2:
-            output = LogicGate.evaluate_xor(inputs)
-
-        elif comp.type == ComponentType.XNOR_2:
-            output = LogicGate.evaluate_xnor(inputs)
+        inputs = [signals[slot] for slot in self._driver_slots[comp.id]]
+        family = self.GATE_FAMILY.get(comp.type, -1)
+        output = _GATE_FNS[family](inputs) if family >= 0 else SignalState.UNDEFINED
 
         # Set output pin states
-        for pin in comp.pins:
-            if pin.type.value == "output":
-                pin_states[comp.id][pin.id] = output
+        for slot in self._output_slots[comp.id]:
+            signals[slot] = output
 
     def _evaluate_output_device(
         self,
         comp: CircuitComponent,
-        pin_states: dict[str, dict[str, SignalState]]
+        signals: list[SignalState]
     ) -> None:
         """Evaluate an output device (LED, etc.) - just propagate input to state."""
-        inputs = self._get_input_signals(comp, pin_states)
-
         # Store the input state for visualization
-        for i, pin in enumerate(comp.pins):
-            if pin.type.value == "input" and i < len(inputs):
-                pin_states[comp.id][pin.id] = inputs[i]
+        for slot, driver in zip(self._input_slots[comp.id], self._driver_slots[comp.id], strict=True):
+            signals[slot] = signals[driver]
 
 
 # Singleton instance
@@ -2,12 +2,19 @@
 
 from app.websocket.broadcaster import RoomManager, room_manager
 from app.websocket.handler import WebSocketHandler, ws_handler
-from app.websocket.messages import ClientMessage, ServerMessage
+from app.websocket.messages import (
+    ClientMessage,
+    ClientMessageAdapter,
+    ServerMessage,
+    ServerMessageAdapter,
+)
 
 __all__ = [
     "ClientMessage",
+    "ClientMessageAdapter",
     "RoomManager",
     "ServerMessage",
+    "ServerMessageAdapter",
     "WebSocketHandler",
     "room_manager",
     "ws_handler",
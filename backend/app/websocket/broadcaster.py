@@ -1,11 +1,37 @@
 """WebSocket room manager and broadcaster."""
 
 import asyncio
-from collections import defaultdict
+import contextlib
+from collections import defaultdict, deque
 from typing import Any
 
+import orjson
 from fastapi import WebSocket
 
+# Limits for coalescing queued frames into a single batch frame
+MAX_BATCH_MESSAGES = 128
+MAX_BATCH_BYTES = 64 * 1024
+# Queued frames per connection beyond which lossy frames are dropped
+MAX_QUEUED_FRAMES = 256
+# Hard cap on queued frames; a client this far behind is disconnected
+MAX_OUTBOX_FRAMES = 1024
+# Close code sent to a client dropped for falling too far behind
+SLOW_CLIENT_CLOSE_CODE = 1013
+# How long an idle writer holds lossy frames so a stream of them is batched
+LOSSY_FLUSH_DELAY = 0.002
+# How long disconnect waits for queued frames to flush
+WRITER_CLOSE_TIMEOUT = 2.0
+
+_BATCH_PREFIX = b'{"type":"batch","payload":['
+_BATCH_SUFFIX = b"]}"
+
+
+def _encode(message: dict[str, Any] | bytes) -> bytes:
+    """Serialize a message with orjson unless it is already bytes."""
+    if isinstance(message, bytes):
+        return message
+    return orjson.dumps(message)
+
 
 class ConnectionInfo:
     """Information about a WebSocket connection."""
@@ -19,6 +45,134 @@ class ConnectionInfo:
         self.websocket = websocket
         self.session_code = session_code
         self.participant_id = participant_id
+        # Cached edit permission, kept in sync by the permission handlers
+        self.can_edit = False
+        self.closed = False
+        # Outbound frames as (data, lossy) pairs, drained by the writer task
+        self._outbox: deque[tuple[bytes, bool]] = deque()
+        self._ready = asyncio.Event()
+        # Set when queued frames should go out without the lossy flush delay
+        self._flush = asyncio.Event()
+        self._writer: asyncio.Task[None] | None = None
+        self._closer: asyncio.Task[None] | None = None
+
+    def start_writer(self) -> None:
+        """Start the background task that drains the outbound queue."""
+        self._writer = asyncio.create_task(self._run_writer())
+
+    def send(self, data: bytes, lossy: bool = False) -> bool:
+        """
+        Queue a serialized frame for sending. Returns False if not queued.
+
+        Lossy frames (cursor moves, simulation state) are superseded by later
+        ones, so when a slow client's queue is full the oldest lossy frame
+        is dropped to make room. Other frames are never dropped; a client
+        whose backlog of them reaches MAX_OUTBOX_FRAMES is disconnected
+        instead, since it could no longer be brought up to date.
+        """
+        if self.closed:
+            return False
+
+        outbox = self._outbox
+        if len(outbox) >= MAX_QUEUED_FRAMES:
+            for i, (_, queued_lossy) in enumerate(outbox):
+                if queued_lossy:
+                    del outbox[i]
+                    break
+            else:
+                if lossy:
+                    return False
+                if len(outbox) >= MAX_OUTBOX_FRAMES:
+                    self._abort()
+                    return False
+
+        outbox.append((data, lossy))
+        self._ready.set()
+        if not lossy:
+            self._flush.set()
+        return True
+
+    async def close(self) -> None:
+        """Flush queued frames and stop the writer task."""
+        self.closed = True
+        if self._writer is None or self._writer.done():
+            return
+        self._ready.set()
+        self._flush.set()
+        with contextlib.suppress(TimeoutError, asyncio.CancelledError):
+            await asyncio.wait_for(self._writer, timeout=WRITER_CLOSE_TIMEOUT)
+
+    def _abort(self) -> None:
+        """Drop the queued frames and close the socket of a stalled client."""
+        self.closed = True
+        self._outbox.clear()
+        self._ready.set()
+        self._flush.set()
+        self._closer = asyncio.create_task(self._close_socket())
+
+    async def _close_socket(self) -> None:
+        """Close the websocket; the handler's receive loop then disconnects."""
+        with contextlib.suppress(Exception):
+            await self.websocket.close(code=SLOW_CLIENT_CLOSE_CODE)
+
+    async def _run_writer(self) -> None:
+        """
+        Send queued frames in order.
+
+        When several frames are already waiting (a burst), they are drained
+        without blocking and shipped as one batch frame; an idle connection
+        sends each frame immediately. The exception is an idle connection
+        with only lossy frames queued: they are held for LOSSY_FLUSH_DELAY so
+        that a stream of cursor moves goes out as a few batches rather than
+        one tiny frame each, unless a critical frame arrives first. Each
+        connection has its own writer, so a slow client never delays the
+        rest of the room.
+        """
+        outbox = self._outbox
+        idle = True
+        while True:
+            if not outbox:
+                if self.closed:
+                    break
+                self._ready.clear()
+                await self._ready.wait()
+                idle = True
+                continue
+
+            if (
+                idle
+                and not self.closed
+                and all(lossy for _, lossy in outbox)
+            ):
+                # Clearing is safe only here: no critical frame is waiting
+                self._flush.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._flush.wait(), LOSSY_FLUSH_DELAY)
+            idle = False
+
+            batch: list[bytes] = []
+            size = 0
+            while (
+                outbox
+                and len(batch) < MAX_BATCH_MESSAGES
+                and size < MAX_BATCH_BYTES
+            ):
+                data, _ = outbox.popleft()
+                batch.append(data)
+                size += len(data)
+
+            if len(batch) == 1:
+                frame = batch[0]
+            else:
+                frame = _BATCH_PREFIX + b",".join(batch) + _BATCH_SUFFIX
+
+            try:
+                await self.websocket.send_bytes(frame)
+            except Exception:
+                break
+
+        self.closed = True
+        outbox.clear()
 
 
 class RoomManager:
@@ -29,6 +183,8 @@ class RoomManager:
         self._rooms: dict[str, set[ConnectionInfo]] = defaultdict(set)
         # participant_id -> ConnectionInfo (for direct messaging)
         self._connections: dict[str, ConnectionInfo] = {}
+        # session_code -> {key: resource} kept alive while the room is open
+        self._resources: dict[str, dict[str, Any]] = {}
         self._lock = asyncio.Lock()
 
     async def connect(
@@ -41,6 +197,7 @@ class RoomManager:
         await websocket.accept()
 
         conn = ConnectionInfo(websocket, session_code, participant_id)
+        conn.start_writer()
 
         async with self._lock:
             self._rooms[session_code].add(conn)
@@ -51,70 +208,67 @@ class RoomManager:
     async def disconnect(self, participant_id: str) -> str | None:
         """
         Remove a connection from its room.
-        
+
         Returns the session code if found.
         """
         async with self._lock:
             conn = self._connections.pop(participant_id, None)
             if conn:
                 self._rooms[conn.session_code].discard(conn)
-                # Clean up empty rooms
+                # Clean up empty rooms and release their resources
                 if not self._rooms[conn.session_code]:
                     del self._rooms[conn.session_code]
-                return conn.session_code
+                    self._resources.pop(conn.session_code, None)
+
+        if conn:
+            await conn.close()
+            return conn.session_code
         return None
 
-    async def broadcast_to_room(
+    def attach_resource(self, session_code: str, key: str, resource: Any) -> None:
+        """Keep a resource alive until detached or the room empties."""
+        if session_code in self._rooms:
+            self._resources.setdefault(session_code, {})[key] = resource
+
+    def detach_resource(self, session_code: str, key: str) -> None:
+        """Release a resource attached to a room."""
+        resources = self._resources.get(session_code)
+        if resources is not None:
+            resources.pop(key, None)
+
+    async def broadcast_bytes(
         self,
         session_code: str,
-        message: dict[str, Any],
+        data: bytes,
         exclude_participant: str | None = None,
+        lossy: bool = False,
     ) -> None:
-        """Broadcast a message to all connections in a room."""
+        """
+        Fan out an already-serialized frame to all connections in a room.
+
+        Frames are queued per connection; see ConnectionInfo.send for lossy.
+        """
         async with self._lock:
             connections = list(self._rooms.get(session_code, set()))
 
-        tasks = []
         for conn in connections:
             if exclude_participant and conn.participant_id == exclude_participant:
                 continue
-            tasks.append(self._send_safe(conn.websocket, message))
-
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            conn.send(data, lossy)
 
     async def send_to_participant(
         self,
         participant_id: str,
-        message: dict[str, Any],
+        message: dict[str, Any] | bytes,
     ) -> bool:
         """Send a message to a specific participant."""
         async with self._lock:
             conn = self._connections.get(participant_id)
 
         if conn:
-            return await self._send_safe(conn.websocket, message)
+            return conn.send(_encode(message))
         return False
 
-    async def send_to_teacher(
-        self,
-        session_code: str,
-        message: dict[str, Any],
-        teacher_id: str,
-    ) -> bool:
-        """Send a message to the teacher of a session."""
-        return await self.send_to_participant(teacher_id, message)
-
-    async def _send_safe(
-        self, websocket: WebSocket, message: dict[str, Any]
-    ) -> bool:
-        """Safely send a message, handling connection errors."""
-        try:
-            await websocket.send_json(message)
-            return True
-        except Exception:
-            return False
-
     def get_room_participants(self, session_code: str) -> list[str]:
         """Get list of participant IDs in a room."""
         return [
@@ -126,6 +280,10 @@ class RoomManager:
         """Get number of connections in a room."""
         return len(self._rooms.get(session_code, set()))
 
+    def get_connection(self, participant_id: str) -> ConnectionInfo | None:
+        """Get the connection for a participant, if connected."""
+        return self._connections.get(participant_id)
+
     def is_connected(self, participant_id: str) -> bool:
         """Check if a participant is connected."""
         return participant_id in self._connections
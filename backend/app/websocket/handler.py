@@ -1,9 +1,13 @@
 """WebSocket connection handler."""
 
-import json
+import asyncio
+from collections.abc import Awaitable, Callable
 from typing import Any
+from weakref import WeakValueDictionary
 
-from fastapi import WebSocket, WebSocketDisconnect
+import orjson
+from fastapi import WebSocket
+from pydantic import ValidationError
 
 from app.core.database import db_manager
 from app.exceptions.base import (
@@ -11,13 +15,62 @@ from app.exceptions.base import (
     AuthorizationException,
     NotFoundException,
 )
-from app.models.circuit import Annotation, CircuitComponent, Position, Wire
+from app.models.circuit import Position
 from app.models.session import Role
 from app.services.circuit_service import CircuitService
 from app.services.permission_service import PermissionService
 from app.services.session_service import SessionService
 from app.services.simulation_engine import SimulationEngine
-from app.websocket.broadcaster import room_manager
+from app.websocket.broadcaster import ConnectionInfo, room_manager
+from app.websocket.messages import (
+    AnnotationAddPayload,
+    AnnotationRefPayload,
+    ClientMessage,
+    ComponentAddPayload,
+    ComponentMovePayload,
+    ComponentRefPayload,
+    CursorMovePayload,
+    ErrorMessage,
+    ErrorPayload,
+    ParticipantRefPayload,
+    SelectionChangePayload,
+    WireAddPayload,
+    WireRefPayload,
+    decode_client_frame,
+    dump_frame,
+)
+
+# (handler, needs_payload, needs_edit_permission)
+_Route = tuple[Callable[..., Awaitable[None]], bool, bool]
+
+# Interval between cursor broadcasts; moves in between are coalesced
+CURSOR_FLUSH_INTERVAL = 1 / 30
+
+# Fixed envelope of the per-tick simulation update; only the payload varies
+_SIM_UPDATE_ENVELOPE = b'{"type":"simulation:state:updated","payload":'
+
+# Mutations echoed to the room with the client's own (validated) payload dict
+_FORWARDS_PAYLOAD = frozenset(
+    {
+        "circuit:component:add",
+        "circuit:component:move",
+        "circuit:wire:add",
+        "circuit:annotation:add",
+    }
+)
+
+# Circuit messages any participant may send without edit permission
+_CIRCUIT_NO_PERM = frozenset({"circuit:undo", "circuit:redo"})
+
+
+def _requires_edit(msg_type: str) -> bool:
+    """Whether a message type must pass the edit permission check."""
+    return msg_type.startswith("circuit:") and msg_type not in _CIRCUIT_NO_PERM
+
+
+def _error_frame(code: str, message: str) -> bytes:
+    """Build a serialized error message."""
+    return dump_frame(ErrorMessage(payload=ErrorPayload(code=code, message=message)))
 
 
 class WebSocketHandler:
@@ -27,7 +80,48 @@ class WebSocketHandler:
         self._session_service: SessionService | None = None
         self._permission_service: PermissionService | None = None
         self._circuit_service: CircuitService | None = None
-        self._simulations: dict[str, SimulationEngine] = {}  # session_code -> engine
+        # session_code -> engine; the room owns the engine, so it is freed
+        # when the last participant leaves even without simulation:stop
+        self._simulations: WeakValueDictionary[str, SimulationEngine] = (
+            WeakValueDictionary()
+        )
+        # session_code -> (circuit version, serialized circuit)
+        self._sync_cache: dict[str, tuple[int, bytes]] = {}
+        # participant_id -> (session_code, latest cursor position)
+        self._pending_cursor: dict[str, tuple[str, Position]] = {}
+        self._cursor_flush_task: asyncio.Task[None] | None = None
+
+        handlers: dict[str, tuple[Callable[..., Awaitable[None]], bool]] = {
+            # Circuit operations (edit permission except undo/redo)
+            "circuit:component:add": (self._handle_component_add, True),
+            "circuit:component:move": (self._handle_component_move, True),
+            "circuit:component:delete": (self._handle_component_delete, True),
+            "circuit:wire:add": (self._handle_wire_add, True),
+            "circuit:wire:delete": (self._handle_wire_delete, True),
+            "circuit:annotation:add": (self._handle_annotation_add, True),
+            "circuit:annotation:delete": (self._handle_annotation_delete, True),
+            "circuit:undo": (self._handle_undo, False),
+            "circuit:redo": (self._handle_redo, False),
+            # Presence messages
+            "presence:cursor:move": (self._handle_cursor_move, True),
+            "presence:selection:change": (self._handle_selection_change, True),
+            # Permission messages
+            "permission:request:edit": (self._handle_edit_request, False),
+            "permission:approve": (self._handle_permission_approve, True),
+            "permission:deny": (self._handle_permission_deny, True),
+            "permission:revoke": (self._handle_permission_revoke, True),
+            "permission:kick": (self._handle_kick_participant, True),
+            # Simulation messages (handlers check edit permission themselves)
+            "simulation:start": (self._handle_simulation_start, False),
+            "simulation:stop": (self._handle_simulation_stop, False),
+            "simulation:toggle": (self._handle_simulation_toggle, True),
+            "simulation:clock:tick": (self._handle_simulation_clock_tick, True),
+            "simulation:step": (self._handle_simulation_step, False),
+        }
+        self._routes: dict[str, _Route] = {
+            msg_type: (handler, needs_payload, _requires_edit(msg_type))
+            for msg_type, (handler, needs_payload) in handlers.items()
+        }
 
     def _get_services(self) -> None:
         """Initialize services with database connection."""
@@ -46,65 +140,96 @@ class WebSocketHandler:
         """Handle a WebSocket connection lifecycle."""
         self._get_services()
 
-        # Validate session and participant
+        # Validate session and participant concurrently
+        session_found = True
         try:
-            session = await self._session_service.get_session(session_code)
-            participant = await self._session_service.get_participant(
-                session_code, participant_id
-            )
-            if participant is None:
-                await websocket.close(code=4001, reason="Participant not found")
-                return
-        except NotFoundException:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._session_service.get_session(session_code))
+                participant_task = tg.create_task(
+                    self._session_service.get_participant(
+                        session_code, participant_id
+                    )
+                )
+        except* NotFoundException:
+            session_found = False
+
+        if not session_found:
             await websocket.close(code=4004, reason="Session not found")
             return
+        participant = participant_task.result()
+        if participant is None:
+            await websocket.close(code=4001, reason="Participant not found")
+            return
 
-        # Connect to room
-        conn = await room_manager.connect(websocket, session_code, participant_id)
-
-        # Mark participant as active
-        await self._session_service.mark_participant_active(
-            session_code, participant_id
-        )
-
-        # Send initial state
-        await self._send_sync_state(websocket, session_code)
+        # Everything after joining runs under the finally below, so a failure
+        # at any step still disconnects and cancels the snapshot load
+        circuit_task: asyncio.Task[bytes] | None = None
+        try:
+            # Connect to room
+            conn = await room_manager.connect(websocket, session_code, participant_id)
+            conn.can_edit = participant.can_edit
+
+            # Load the circuit snapshot while the join is processed. This
+            # starts only after joining the room, so any change the snapshot
+            # misses is still broadcast to this connection.
+            circuit_task = asyncio.create_task(self._get_circuit_data(session_code))
+
+            # Mark participant as active and broadcast the join
+            await asyncio.gather(
+                self._session_service.mark_participant_active(
+                    session_code, participant_id
+                ),
+                self._broadcast(
+                    session_code,
+                    {
+                        "type": "presence:participant:joined",
+                        "payload": {
+                            "participant": participant.model_dump(by_alias=True),
+                        },
+                    },
+                    exclude_participant=participant_id,
+                ),
+            )
 
-        # Broadcast participant joined
-        await room_manager.broadcast_to_room(
-            session_code,
-            {
-                "type": "presence:participant:joined",
-                "payload": {
-                    "participant": participant.model_dump(by_alias=True),
-                },
-            },
-            exclude_participant=participant_id,
-        )
+            # Send initial state (after marking active so the list includes us)
+            await self._send_sync_state(conn, session_code, circuit_task)
 
-        try:
             while True:
-                # Receive message
-                data = await websocket.receive_text()
-                message = json.loads(data)
+                # Receive message; disconnects arrive as an event, not a raise
+                event = await websocket.receive()
+                if event["type"] == "websocket.disconnect":
+                    break
+                data = event.get("text") or event.get("bytes")
+                if not data:
+                    continue
+                try:
+                    message, raw_payload = decode_client_frame(data)
+                except (orjson.JSONDecodeError, ValidationError):
+                    self._send_error(conn, "INVALID_MESSAGE", "Malformed message.")
+                    continue
 
                 # Route message to handler
                 await self._handle_message(
-                    session_code, participant_id, participant, message
+                    session_code, participant_id, message, raw_payload
                 )
-        except WebSocketDisconnect:
-            pass
         except Exception as e:
-            await self._send_error(websocket, "INTERNAL_ERROR", str(e))
+            await room_manager.send_to_participant(
+                participant_id, _error_frame("INTERNAL_ERROR", str(e))
+            )
         finally:
             # Disconnect and cleanup
+            if circuit_task is not None:
+                circuit_task.cancel()
+            self._pending_cursor.pop(participant_id, None)
             await room_manager.disconnect(participant_id)
+            if room_manager.get_room_count(session_code) == 0:
+                self._sync_cache.pop(session_code, None)
             await self._session_service.mark_participant_inactive(
                 session_code, participant_id
             )
 
             # Broadcast participant left
-            await room_manager.broadcast_to_room(
+            await self._broadcast(
                 session_code,
                 {
                     "type": "presence:participant:left",
@@ -116,255 +241,216 @@ class WebSocketHandler:
         self,
         session_code: str,
         participant_id: str,
-        participant: Any,
-        message: dict[str, Any],
+        message: ClientMessage,
+        raw_payload: dict[str, Any],
     ) -> None:
-        """Route and handle incoming messages."""
-        msg_type = message.get("type", "")
-        payload = message.get("payload", {})
+        """
+        Route and handle incoming messages.
+
+        The message was validated as a whole when decoded, so handlers
+        receive its typed payload. Handlers that echo the payload to the
+        room also get the raw payload dict, so it is not dumped again.
+        """
+        route = self._routes.get(message.type)
+        if route is None:
+            return
+        handler, needs_payload, needs_edit = route
 
         try:
-            # Circuit operations (require edit permission)
-            if msg_type.startswith("circuit:"):
-                if msg_type not in ["circuit:undo", "circuit:redo"]:
-                    await self._permission_service.check_edit_permission(
-                        session_code, participant_id
-                    )
-
-                if msg_type == "circuit:component:add":
-                    await self._handle_component_add(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "circuit:component:move":
-                    await self._handle_component_move(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "circuit:component:delete":
-                    await self._handle_component_delete(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "circuit:wire:add":
-                    await self._handle_wire_add(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "circuit:wire:delete":
-                    await self._handle_wire_delete(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "circuit:annotation:add":
-                    await self._handle_annotation_add(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "circuit:annotation:delete":
-                    await self._handle_annotation_delete(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "circuit:undo":
-                    await self._handle_undo(session_code, participant_id)
-                elif msg_type == "circuit:redo":
-                    await self._handle_redo(session_code, participant_id)
-
-            # Presence messages
-            elif msg_type.startswith("presence:"):
-                if msg_type == "presence:cursor:move":
-                    await self._handle_cursor_move(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "presence:selection:change":
-                    await self._handle_selection_change(
-                        session_code, participant_id, payload
-                    )
-
-            # Permission messages
-            elif msg_type.startswith("permission:"):
-                if msg_type == "permission:request:edit":
-                    await self._handle_edit_request(session_code, participant_id)
-                elif msg_type == "permission:approve":
-                    await self._handle_permission_approve(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "permission:deny":
-                    await self._handle_permission_deny(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "permission:revoke":
-                    await self._handle_permission_revoke(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "permission:kick":
-                    await self._handle_kick_participant(
-                        session_code, participant_id, payload
-                    )
-
-            # Simulation messages (requires edit permission)
-            elif msg_type.startswith("simulation:"):
-                if msg_type == "simulation:start":
-                    await self._handle_simulation_start(
-                        session_code, participant_id
-                    )
-                elif msg_type == "simulation:stop":
-                    await self._handle_simulation_stop(
-                        session_code, participant_id
-                    )
-                elif msg_type == "simulation:toggle":
-                    await self._handle_simulation_toggle(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "simulation:clock:tick":
-                    await self._handle_simulation_clock_tick(
-                        session_code, participant_id, payload
-                    )
-                elif msg_type == "simulation:step":
-                    await self._handle_simulation_step(
-                        session_code, participant_id
-                    )
-
+            if needs_edit:
+                # Uses the permission cached on the connection, which dies with
+                # it, so no per-session cache needs evicting
+                self._check_can_edit(
+                    participant_id,
+                    "edit circuit",
+                    "You do not have edit permission. "
+                    "Request access from the teacher.",
+                )
+            if message.type in _FORWARDS_PAYLOAD:
+                await handler(
+                    session_code, participant_id, message.payload, raw_payload
+                )
+            elif needs_payload:
+                await handler(session_code, participant_id, message.payload)
+            else:
+                await handler(session_code, participant_id)
         except AuthorizationException as e:
             await room_manager.send_to_participant(
                 participant_id,
-                {"type": "error", "payload": {"code": e.code, "message": e.message}},
+                _error_frame(e.code, e.message),
             )
         except AppException as e:
             await room_manager.send_to_participant(
                 participant_id,
-                {"type": "error", "payload": {"code": e.code, "message": e.message}},
+                _error_frame(e.code, e.message),
             )
 
     async def _send_sync_state(
-        self, websocket: WebSocket, session_code: str
+        self,
+        conn: ConnectionInfo,
+        session_code: str,
+        circuit_data: Awaitable[bytes],
     ) -> None:
-        """Send current circuit state and participants."""
-        circuit = await self._circuit_service.get_circuit_state(session_code)
-        participants = await self._session_service.get_session_participants(
-            session_code
-        )
+        """
+        Send current circuit state and participants.
+
+        circuit_data is the (usually already running) _get_circuit_data
+        call, so the circuit load overlaps the join handshake. The
+        serialized circuit is cached per session and reused while the
+        circuit version is unchanged, so a burst of joins replays and dumps
+        the circuit only once. Participants are always serialized fresh.
+        """
+        circuit_bytes, participants = await asyncio.gather(
+            circuit_data,
+            self._session_service.get_session_participants(session_code),
+        )
+        participants_data = orjson.dumps(
+            [p.model_dump(by_alias=True) for p in participants]
+        )
+
+        conn.send(
+            b'{"type":"sync:state","payload":{"circuit":'
+            + circuit_bytes
+            + b',"participants":'
+            + participants_data
+            + b"}}"
+        )
+
+    async def _get_circuit_data(self, session_code: str) -> bytes:
+        """Get the serialized circuit, reusing the cache if still current."""
+        version = await self._circuit_service.get_latest_version(session_code)
+        cached = self._sync_cache.get(session_code)
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
-        await websocket.send_json({
-            "type": "sync:state",
-            "payload": {
-                "circuit": circuit.model_dump(by_alias=True, mode='json'),
-                "participants": [p.model_dump(by_alias=True, mode='json') for p in participants],
-            },
-        })
+        circuit = await self._circuit_service.get_circuit_state(session_code)
+        circuit_data = orjson.dumps(circuit.model_dump(by_alias=True))
+        self._sync_cache[session_code] = (version, circuit_data)
+        return circuit_data
 
-    async def _send_error(
-        self, websocket: WebSocket, code: str, message: str
+    @staticmethod
+    async def _broadcast(
+        session_code: str,
+        message: dict[str, Any],
+        exclude_participant: str | None = None,
+        lossy: bool = False,
     ) -> None:
-        """Send error message to client."""
-        try:
-            await websocket.send_json({
-                "type": "error",
-                "payload": {"code": code, "message": message},
-            })
-        except Exception:
-            pass
+        """
+        Serialize a message once and fan the bytes out to the room.
+
+        Pass lossy=True for messages superseded by later ones (cursor
+        moves, simulation state); slow clients may drop those.
+        """
+        await room_manager.broadcast_bytes(
+            session_code, orjson.dumps(message), exclude_participant, lossy
+        )
+
+    def _send_error(self, conn: ConnectionInfo, code: str, message: str) -> None:
+        """Queue an error message for the client."""
+        conn.send(_error_frame(code, message))
 
     # Circuit operation handlers
     async def _handle_component_add(
-        self, session_code: str, user_id: str, payload: dict[str, Any]
+        self,
+        session_code: str,
+        user_id: str,
+        payload: ComponentAddPayload,
+        raw_payload: dict[str, Any],
     ) -> None:
         """Handle component add."""
-        component = CircuitComponent.model_validate(payload["component"])
         event, state = await self._circuit_service.add_component(
-            session_code, user_id, component
+            session_code, user_id, payload.component
         )
 
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "circuit:component:added",
                 "payload": {
-                    "component": component.model_dump(by_alias=True),
+                    "component": raw_payload["component"],
                     "userId": user_id,
                 },
             },
         )
 
     async def _handle_component_move(
-        self, session_code: str, user_id: str, payload: dict[str, Any]
+        self,
+        session_code: str,
+        user_id: str,
+        payload: ComponentMovePayload,
+        raw_payload: dict[str, Any],
     ) -> None:
         """Handle component move."""
-        component_id = payload["componentId"]
-        position = Position.model_validate(payload["position"])
-
         event, state = await self._circuit_service.move_component(
-            session_code, user_id, component_id, position
+            session_code, user_id, payload.component_id, payload.position
         )
 
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "circuit:component:moved",
                 "payload": {
-                    "componentId": component_id,
-                    "position": position.model_dump(),
+                    "componentId": payload.component_id,
+                    "position": raw_payload["position"],
                     "userId": user_id,
                 },
             },
         )
 
     async def _handle_component_delete(
-        self, session_code: str, user_id: str, payload: dict[str, Any]
+        self, session_code: str, user_id: str, payload: ComponentRefPayload
     ) -> None:
         """Handle component delete (with wire cascade)."""
-        component_id = payload["componentId"]
+        component_id = payload.component_id
 
         events, state = await self._circuit_service.delete_component(
             session_code, user_id, component_id
         )
 
-        # Broadcast wire deletions first
-        for event in events[:-1]:  # All but last (component delete)
-            await room_manager.broadcast_to_room(
-                session_code,
-                {
-                    "type": "circuit:wire:deleted",
-                    "payload": {
-                        "wireId": event.payload.wire_id,
-                        "userId": user_id,
-                    },
-                },
-            )
-
-        # Broadcast component deletion
-        await room_manager.broadcast_to_room(
+        # Broadcast cascaded wire deletions and the component deletion together
+        await self._broadcast(
             session_code,
             {
-                "type": "circuit:component:deleted",
-                "payload": {"componentId": component_id, "userId": user_id},
+                "type": "circuit:batch:deleted",
+                "payload": {
+                    # All events but the last (component delete) are wire deletes
+                    "wireIds": [event.payload.wire_id for event in events[:-1]],
+                    "componentId": component_id,
+                    "userId": user_id,
+                },
             },
         )
 
     async def _handle_wire_add(
-        self, session_code: str, user_id: str, payload: dict[str, Any]
+        self,
+        session_code: str,
+        user_id: str,
+        payload: WireAddPayload,
+        raw_payload: dict[str, Any],
     ) -> None:
         """Handle wire add."""
-        wire = Wire.model_validate(payload["wire"])
         event, state = await self._circuit_service.add_wire(
-            session_code, user_id, wire
+            session_code, user_id, payload.wire
         )
 
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "circuit:wire:added",
-                "payload": {
-                    "wire": wire.model_dump(by_alias=True),
-                    "userId": user_id,
-                },
+                "payload": {"wire": raw_payload["wire"], "userId": user_id},
             },
         )
 
     async def _handle_wire_delete(
-        self, session_code: str, user_id: str, payload: dict[str, Any]
+        self, session_code: str, user_id: str, payload: WireRefPayload
     ) -> None:
         """Handle wire delete."""
-        wire_id = payload["wireId"]
+        wire_id = payload.wire_id
         event, state = await self._circuit_service.delete_wire(
             session_code, user_id, wire_id
         )
 
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "circuit:wire:deleted",
@@ -373,35 +459,38 @@ class WebSocketHandler:
         )
 
     async def _handle_annotation_add(
-        self, session_code: str, user_id: str, payload: dict[str, Any]
+        self,
+        session_code: str,
+        user_id: str,
+        payload: AnnotationAddPayload,
+        raw_payload: dict[str, Any],
     ) -> None:
         """Handle annotation add."""
-        annotation = Annotation.model_validate(payload["annotation"])
         event, state = await self._circuit_service.add_annotation(
-            session_code, user_id, annotation
+            session_code, user_id, payload.annotation
         )
 
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "circuit:annotation:added",
                 "payload": {
-                    "annotation": annotation.model_dump(by_alias=True),
+                    "annotation": raw_payload["annotation"],
                     "userId": user_id,
                 },
             },
         )
 
     async def _handle_annotation_delete(
-        self, session_code: str, user_id: str, payload: dict[str, Any]
+        self, session_code: str, user_id: str, payload: AnnotationRefPayload
     ) -> None:
         """Handle annotation delete."""
-        annotation_id = payload["annotationId"]
+        annotation_id = payload.annotation_id
         event, state = await self._circuit_service.delete_annotation(
             session_code, user_id, annotation_id
         )
 
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "circuit:annotation:deleted",
@@ -414,7 +503,7 @@ class WebSocketHandler:
         result = await self._circuit_service.undo(session_code, user_id)
         if result:
             event, state = result
-            await room_manager.broadcast_to_room(
+            await self._broadcast(
                 session_code,
                 {
                     "type": "circuit:state:updated",
@@ -427,7 +516,7 @@ class WebSocketHandler:
         result = await self._circuit_service.redo(session_code, user_id)
         if result:
             event, state = result
-            await room_manager.broadcast_to_room(
+            await self._broadcast(
                 session_code,
                 {
                     "type": "circuit:state:updated",
@@ -437,32 +526,51 @@ class WebSocketHandler:
 
     # Presence handlers
     async def _handle_cursor_move(
-        self, session_code: str, participant_id: str, payload: dict[str, Any]
+        self, session_code: str, participant_id: str, payload: CursorMovePayload
     ) -> None:
-        """Handle cursor move (broadcast to others)."""
-        await room_manager.broadcast_to_room(
-            session_code,
-            {
-                "type": "presence:cursor:moved",
-                "payload": {
-                    "participantId": participant_id,
-                    "position": payload.get("position"),
-                },
-            },
-            exclude_participant=participant_id,
-        )
+        """
+        Handle cursor move (broadcast to others).
+
+        Only the latest position per participant is kept; a flush task
+        broadcasts pending positions at most every CURSOR_FLUSH_INTERVAL.
+        """
+        self._pending_cursor[participant_id] = (session_code, payload.position)
+        if self._cursor_flush_task is None or self._cursor_flush_task.done():
+            self._cursor_flush_task = asyncio.create_task(self._flush_cursors())
+
+    async def _flush_cursors(self) -> None:
+        """Broadcast coalesced cursor positions until none are pending."""
+        while self._pending_cursor:
+            await asyncio.sleep(CURSOR_FLUSH_INTERVAL)
+            pending, self._pending_cursor = self._pending_cursor, {}
+            for participant_id, (session_code, position) in pending.items():
+                await self._broadcast(
+                    session_code,
+                    {
+                        "type": "presence:cursor:moved",
+                        "payload": {
+                            "participantId": participant_id,
+                            "position": position.model_dump(),
+                        },
+                    },
+                    exclude_participant=participant_id,
+                    lossy=True,
+                )
 
     async def _handle_selection_change(
-        self, session_code: str, participant_id: str, payload: dict[str, Any]
+        self,
+        session_code: str,
+        participant_id: str,
+        payload: SelectionChangePayload,
     ) -> None:
         """Handle selection change (broadcast to others)."""
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "presence:selection:changed",
                 "payload": {
                     "participantId": participant_id,
-                    "componentIds": payload.get("componentIds", []),
+                    "componentIds": payload.component_ids,
                 },
             },
             exclude_participant=participant_id,
@@ -492,29 +600,31 @@ class WebSocketHandler:
             },
         )
 
-        # Notify teacher
-        await room_manager.send_to_participant(
-            session.creator_participant_id,
-            {
-                "type": "permission:request:received",
-                "payload": {
-                    "participantId": participant_id,
-                    "displayName": request.display_name,
+        # Notify teacher (skip building the message if they are offline)
+        if room_manager.is_connected(session.creator_participant_id):
+            await room_manager.send_to_participant(
+                session.creator_participant_id,
+                {
+                    "type": "permission:request:received",
+                    "payload": {
+                        "participantId": participant_id,
+                        "displayName": request.display_name,
+                    },
                 },
-            },
-        )
+            )
 
     async def _handle_permission_approve(
-        self, session_code: str, teacher_id: str, payload: dict[str, Any]
+        self, session_code: str, teacher_id: str, payload: ParticipantRefPayload
     ) -> None:
         """Handle permission approval."""
-        student_id = payload["participantId"]
+        student_id = payload.participant_id
         await self._permission_service.approve_edit_request(
             session_code, teacher_id, student_id
         )
+        self._set_can_edit(student_id, True)
 
         # Broadcast to all (student will show toast, others update UI)
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "permission:granted",
@@ -523,16 +633,17 @@ class WebSocketHandler:
         )
 
     async def _handle_permission_deny(
-        self, session_code: str, teacher_id: str, payload: dict[str, Any]
+        self, session_code: str, teacher_id: str, payload: ParticipantRefPayload
     ) -> None:
         """Handle permission denial."""
-        student_id = payload["participantId"]
+        student_id = payload.participant_id
         await self._permission_service.deny_edit_request(
             session_code, teacher_id, student_id
         )
+        self._set_can_edit(student_id, False)
 
         # Broadcast to all (student will show toast, others update UI)
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "permission:denied",
@@ -541,16 +652,17 @@ class WebSocketHandler:
         )
 
     async def _handle_permission_revoke(
-        self, session_code: str, teacher_id: str, payload: dict[str, Any]
+        self, session_code: str, teacher_id: str, payload: ParticipantRefPayload
     ) -> None:
         """Handle permission revocation."""
-        student_id = payload["participantId"]
+        student_id = payload.participant_id
         await self._permission_service.revoke_edit_permission(
             session_code, teacher_id, student_id
         )
+        self._set_can_edit(student_id, False)
 
         # Broadcast to all (student will show toast, others update UI)
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "permission:revoked",
@@ -559,10 +671,10 @@ class WebSocketHandler:
         )
 
     async def _handle_kick_participant(
-        self, session_code: str, teacher_id: str, payload: dict[str, Any]
+        self, session_code: str, teacher_id: str, payload: ParticipantRefPayload
     ) -> None:
         """Handle kicking a participant from the session."""
-        student_id = payload["participantId"]
+        student_id = payload.participant_id
 
         # Verify teacher has permission
         teacher = await self._session_service.get_participant(session_code, teacher_id)
@@ -584,22 +696,23 @@ class WebSocketHandler:
             )
 
         # Notify the student they're being kicked (before disconnecting)
-        await room_manager.send_to_participant(
-            student_id,
-            {
-                "type": "session:kicked",
-                "payload": {"participantId": student_id},
-            },
-        )
+        if room_manager.is_connected(student_id):
+            await room_manager.send_to_participant(
+                student_id,
+                {
+                    "type": "session:kicked",
+                    "payload": {"participantId": student_id},
+                },
+            )
 
-        # Disconnect the student
-        await room_manager.disconnect(student_id)
+            # Disconnect the student
+            await room_manager.disconnect(student_id)
 
         # Permanently remove participant from the session
         await self._session_service.remove_participant(session_code, student_id)
 
         # Broadcast to all remaining participants
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "presence:participant:kicked",
@@ -610,19 +723,43 @@ class WebSocketHandler:
             },
         )
 
+    @staticmethod
+    async def _broadcast_simulation_state(
+        session_code: str, engine: SimulationEngine
+    ) -> None:
+        """Broadcast the engine's current wire and pin states."""
+        body = orjson.dumps({
+            "wireStates": engine.get_wire_states_compact(),
+            "pinStates": engine.get_pin_states(),
+        })
+        await room_manager.broadcast_bytes(
+            session_code, _SIM_UPDATE_ENVELOPE + body + b"}", lossy=True
+        )
+
+    @staticmethod
+    def _set_can_edit(participant_id: str, can_edit: bool) -> None:
+        """Update the cached edit permission on a participant's connection."""
+        conn = room_manager.get_connection(participant_id)
+        if conn is not None:
+            conn.can_edit = can_edit
+
+    @staticmethod
+    def _check_can_edit(participant_id: str, action: str, reason: str) -> None:
+        """Raise unless the participant's connection has edit permission."""
+        conn = room_manager.get_connection(participant_id)
+        if conn is None or not conn.can_edit:
+            raise AuthorizationException(action, reason)
+
     # Simulation handlers
     async def _handle_simulation_start(
         self, session_code: str, participant_id: str
     ) -> None:
         """Start simulation with current circuit state."""
-        participant = await self._session_service.get_participant(
-            session_code, participant_id
+        self._check_can_edit(
+            participant_id,
+            "start simulation",
+            "Edit permission required to start simulation.",
         )
-        if participant is None or not participant.can_edit:
-            raise AuthorizationException(
-                "start simulation",
-                "Edit permission required to start simulation.",
-            )
 
         # Load circuit and create simulation engine
         circuit = await self._circuit_service.get_circuit_state(session_code)
@@ -630,9 +767,10 @@ class WebSocketHandler:
         engine.load_circuit(circuit)
         engine.run()  # Run initial simulation
         self._simulations[session_code] = engine
+        room_manager.attach_resource(session_code, "simulation", engine)
 
         # Broadcast simulation started with initial state
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "simulation:started",
@@ -648,19 +786,17 @@ class WebSocketHandler:
         self, session_code: str, participant_id: str
     ) -> None:
         """Stop simulation and cleanup."""
-        participant = await self._session_service.get_participant(
-            session_code, participant_id
+        self._check_can_edit(
+            participant_id,
+            "stop simulation",
+            "Edit permission required to stop simulation.",
         )
-        if participant is None or not participant.can_edit:
-            raise AuthorizationException(
-                "stop simulation",
-                "Edit permission required to stop simulation.",
-            )
 
         # Remove simulation engine
         self._simulations.pop(session_code, None)
+        room_manager.detach_resource(session_code, "simulation")
 
-        await room_manager.broadcast_to_room(
+        await self._broadcast(
             session_code,
             {
                 "type": "simulation:stopped",
@@ -669,81 +805,54 @@ class WebSocketHandler:
         )
 
     async def _handle_simulation_toggle(
-        self, session_code: str, participant_id: str, payload: dict[str, Any]
+        self, session_code: str, participant_id: str, payload: ComponentRefPayload
     ) -> None:
         """Toggle a switch component in simulation."""
-        participant = await self._session_service.get_participant(
-            session_code, participant_id
+        self._check_can_edit(
+            participant_id,
+            "toggle switch",
+            "Edit permission required to toggle switch.",
         )
-        if participant is None or not participant.can_edit:
-            raise AuthorizationException(
-                "toggle switch",
-                "Edit permission required to toggle switch.",
-            )
 
         engine = self._simulations.get(session_code)
         if not engine:
             return
 
-        component_id = payload["componentId"]
+        component_id = payload.component_id
         engine.toggle_switch(component_id)
         engine.run()
 
-        await room_manager.broadcast_to_room(
-            session_code,
-            {
-                "type": "simulation:state:updated",
-                "payload": {
-                    "wireStates": engine.get_wire_states(),
-                    "pinStates": engine.get_pin_states(),
-                },
-            },
-        )
+        await self._broadcast_simulation_state(session_code, engine)
 
     async def _handle_simulation_clock_tick(
-        self, session_code: str, participant_id: str, payload: dict[str, Any]
+        self, session_code: str, participant_id: str, payload: ComponentRefPayload
     ) -> None:
         """Tick a clock component in simulation."""
-        participant = await self._session_service.get_participant(
-            session_code, participant_id
+        self._check_can_edit(
+            participant_id,
+            "tick clock",
+            "Edit permission required to tick clock.",
         )
-        if participant is None or not participant.can_edit:
-            raise AuthorizationException(
-                "tick clock",
-                "Edit permission required to tick clock.",
-            )
 
         engine = self._simulations.get(session_code)
         if not engine:
             return
 
-        component_id = payload["componentId"]
+        component_id = payload.component_id
         engine.tick_clock(component_id)
         engine.run()
 
-        await room_manager.broadcast_to_room(
-            session_code,
-            {
-                "type": "simulation:state:updated",
-                "payload": {
-                    "wireStates": engine.get_wire_states(),
-                    "pinStates": engine.get_pin_states(),
-                },
-            },
-        )
+        await self._broadcast_simulation_state(session_code, engine)
 
     async def _handle_simulation_step(
         self, session_code: str, participant_id: str
     ) -> None:
         """Run one simulation step."""
-        participant = await self._session_service.get_participant(
-            session_code, participant_id
+        self._check_can_edit(
+            participant_id,
+            "step simulation",
+            "Edit permission required to step simulation.",
         )
-        if participant is None or not participant.can_edit:
-            raise AuthorizationException(
-                "step simulation",
-                "Edit permission required to step simulation.",
-            )
 
         engine = self._simulations.get(session_code)
         if not engine:
@@ -751,16 +860,7 @@ class WebSocketHandler:
 
         engine.step()
 
-        await room_manager.broadcast_to_room(
-            session_code,
-            {
-                "type": "simulation:state:updated",
-                "payload": {
-                    "wireStates": engine.get_wire_states(),
-                    "pinStates": engine.get_pin_states(),
-                },
-            },
-        )
+        await self._broadcast_simulation_state(session_code, engine)
 
 
 # Global handler instance
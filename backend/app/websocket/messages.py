@@ -1,288 +1,562 @@
 """WebSocket message type definitions."""
 
-from typing import Any, Literal, Union
+from typing import Annotated, Any, Final, Literal
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter
+
+from app.models.circuit import (
+    Annotation,
+    CircuitComponent,
+    CircuitState,
+    Position,
+    Wire,
+)
+from app.models.session import Participant
+
+
+class _Payload(BaseModel):
+    """Base for message payloads (camelCase on the wire)."""
+
+    model_config = {"populate_by_name": True}
+
+
+class _Message(BaseModel):
+    """Base for message envelopes: immutable, with only type and payload."""
+
+    model_config = {"frozen": True, "extra": "forbid"}
+
+
+# Client -> Server Payloads
+class EmptyPayload(_Payload):
+    """Payload of messages that carry no data."""
+
+
+class ComponentAddPayload(_Payload):
+    """Add component message payload."""
+    component: CircuitComponent
+
+
+class ComponentMovePayload(_Payload):
+    """Move component message payload."""
+    component_id: str = Field(alias="componentId")
+    position: Position
+
+
+class ComponentRefPayload(_Payload):
+    """Payload naming a single component."""
+    component_id: str = Field(alias="componentId")
+
+
+class WireAddPayload(_Payload):
+    """Add wire message payload."""
+    wire: Wire
+
+
+class WireRefPayload(_Payload):
+    """Payload naming a single wire."""
+    wire_id: str = Field(alias="wireId")
+
+
+class AnnotationAddPayload(_Payload):
+    """Add annotation message payload."""
+    annotation: Annotation
+
+
+class AnnotationRefPayload(_Payload):
+    """Payload naming a single annotation."""
+    annotation_id: str = Field(alias="annotationId")
+
+
+class CursorMovePayload(_Payload):
+    """Cursor move message payload."""
+    position: Position
+
+
+class SelectionChangePayload(_Payload):
+    """Selection change message payload."""
+    component_ids: list[str] = Field(default_factory=list, alias="componentIds")
+
+
+class ParticipantRefPayload(_Payload):
+    """Payload naming a single participant."""
+    participant_id: str = Field(alias="participantId")
+
+
+class SimulationErrorPayload(_Payload):
+    """A simulation error reported alongside simulation state."""
+    error_type: str = Field(alias="errorType")
+    message: str
+    component_id: str | None = Field(default=None, alias="componentId")
+    pin_id: str | None = Field(default=None, alias="pinId")
+
+
+class SimulationStatePayload(_Payload):
+    """Client-computed simulation state payload."""
+    wire_states: dict[str, str] = Field(alias="wireStates")
+    pin_states: dict[str, dict[str, str]] = Field(alias="pinStates")
+    errors: list[SimulationErrorPayload] = Field(default_factory=list)
 
 
 # Client -> Server Messages
-class ComponentAddMessage(BaseModel):
+class ComponentAddMessage(_Message):
     """Add component message."""
     type: Literal["circuit:component:add"] = "circuit:component:add"
-    payload: dict[str, Any]
+    payload: ComponentAddPayload
 
 
-class ComponentMoveMessage(BaseModel):
+class ComponentMoveMessage(_Message):
     """Move component message."""
     type: Literal["circuit:component:move"] = "circuit:component:move"
-    payload: dict[str, Any]
+    payload: ComponentMovePayload
 
 
-class ComponentDeleteMessage(BaseModel):
+class ComponentDeleteMessage(_Message):
     """Delete component message."""
     type: Literal["circuit:component:delete"] = "circuit:component:delete"
-    payload: dict[str, Any]
+    payload: ComponentRefPayload
 
 
-class WireAddMessage(BaseModel):
+class WireAddMessage(_Message):
     """Add wire message."""
     type: Literal["circuit:wire:add"] = "circuit:wire:add"
-    payload: dict[str, Any]
+    payload: WireAddPayload
 
 
-class WireDeleteMessage(BaseModel):
+class WireDeleteMessage(_Message):
     """Delete wire message."""
     type: Literal["circuit:wire:delete"] = "circuit:wire:delete"
-    payload: dict[str, Any]
+    payload: WireRefPayload
 
 
-class AnnotationAddMessage(BaseModel):
+class AnnotationAddMessage(_Message):
     """Add annotation message."""
     type: Literal["circuit:annotation:add"] = "circuit:annotation:add"
-    payload: dict[str, Any]
+    payload: AnnotationAddPayload
 
 
-class AnnotationDeleteMessage(BaseModel):
+class AnnotationDeleteMessage(_Message):
     """Delete annotation message."""
     type: Literal["circuit:annotation:delete"] = "circuit:annotation:delete"
-    payload: dict[str, Any]
+    payload: AnnotationRefPayload
 
 
-class UndoMessage(BaseModel):
+class UndoMessage(_Message):
     """Undo message."""
     type: Literal["circuit:undo"] = "circuit:undo"
-    payload: dict[str, Any] = Field(default_factory=dict)
+    payload: EmptyPayload = Field(default_factory=EmptyPayload)
 
 
-class RedoMessage(BaseModel):
+class RedoMessage(_Message):
     """Redo message."""
     type: Literal["circuit:redo"] = "circuit:redo"
-    payload: dict[str, Any] = Field(default_factory=dict)
+    payload: EmptyPayload = Field(default_factory=EmptyPayload)
 
 
-class CursorMoveMessage(BaseModel):
+class CursorMoveMessage(_Message):
     """Cursor move message."""
     type: Literal["presence:cursor:move"] = "presence:cursor:move"
-    payload: dict[str, Any]
+    payload: CursorMovePayload
 
 
-class SelectionChangeMessage(BaseModel):
+class SelectionChangeMessage(_Message):
     """Selection change message."""
     type: Literal["presence:selection:change"] = "presence:selection:change"
-    payload: dict[str, Any]
+    payload: SelectionChangePayload
 
 
-class EditRequestMessage(BaseModel):
+class EditRequestMessage(_Message):
     """Edit request message."""
     type: Literal["permission:request:edit"] = "permission:request:edit"
-    payload: dict[str, Any] = Field(default_factory=dict)
+    payload: EmptyPayload = Field(default_factory=EmptyPayload)
 
 
-class PermissionApproveMessage(BaseModel):
+class PermissionApproveMessage(_Message):
     """Permission approve message."""
     type: Literal["permission:approve"] = "permission:approve"
-    payload: dict[str, Any]
+    payload: ParticipantRefPayload
 
 
-class PermissionDenyMessage(BaseModel):
+class PermissionDenyMessage(_Message):
     """Permission deny message."""
     type: Literal["permission:deny"] = "permission:deny"
-    payload: dict[str, Any]
+    payload: ParticipantRefPayload
 
 
-class PermissionRevokeMessage(BaseModel):
+class PermissionRevokeMessage(_Message):
     """Permission revoke message."""
     type: Literal["permission:revoke"] = "permission:revoke"
-    payload: dict[str, Any]
+    payload: ParticipantRefPayload
 
 
-class SimulationStartMessage(BaseModel):
+class KickMessage(_Message):
+    """Kick participant message."""
+    type: Literal["permission:kick"] = "permission:kick"
+    payload: ParticipantRefPayload
+
+
+class SimulationStartMessage(_Message):
     """Simulation start message."""
     type: Literal["simulation:start"] = "simulation:start"
-    payload: dict[str, Any] = Field(default_factory=dict)
+    payload: EmptyPayload = Field(default_factory=EmptyPayload)
 
 
-class SimulationStopMessage(BaseModel):
+class SimulationStopMessage(_Message):
     """Simulation stop message."""
     type: Literal["simulation:stop"] = "simulation:stop"
-    payload: dict[str, Any] = Field(default_factory=dict)
+    payload: EmptyPayload = Field(default_factory=EmptyPayload)
+
+
+class SimulationToggleMessage(_Message):
+    """Simulation switch toggle message."""
+    type: Literal["simulation:toggle"] = "simulation:toggle"
+    payload: ComponentRefPayload
+
+
+class SimulationClockTickMessage(_Message):
+    """Simulation clock tick message."""
+    type: Literal["simulation:clock:tick"] = "simulation:clock:tick"
+    payload: ComponentRefPayload
 
 
-class SimulationStateMessage(BaseModel):
+class SimulationStepMessage(_Message):
+    """Simulation step message."""
+    type: Literal["simulation:step"] = "simulation:step"
+    payload: EmptyPayload = Field(default_factory=EmptyPayload)
+
+
+class SimulationStateMessage(_Message):
     """Simulation state message."""
     type: Literal["simulation:state"] = "simulation:state"
-    payload: dict[str, Any]
-
-
-ClientMessage = Union[
-    ComponentAddMessage,
-    ComponentMoveMessage,
-    ComponentDeleteMessage,
-    WireAddMessage,
-    WireDeleteMessage,
-    AnnotationAddMessage,
-    AnnotationDeleteMessage,
-    UndoMessage,
-    RedoMessage,
-    CursorMoveMessage,
-    SelectionChangeMessage,
-    EditRequestMessage,
-    PermissionApproveMessage,
-    PermissionDenyMessage,
-    PermissionRevokeMessage,
-    SimulationStartMessage,
-    SimulationStopMessage,
-    SimulationStateMessage,
+    payload: SimulationStatePayload
+
+
+# Discriminated on "type" so validation picks the variant by tag lookup
+ClientMessage = Annotated[
+    (
+        ComponentAddMessage
+        | ComponentMoveMessage
+        | ComponentDeleteMessage
+        | WireAddMessage
+        | WireDeleteMessage
+        | AnnotationAddMessage
+        | AnnotationDeleteMessage
+        | UndoMessage
+        | RedoMessage
+        | CursorMoveMessage
+        | SelectionChangeMessage
+        | EditRequestMessage
+        | PermissionApproveMessage
+        | PermissionDenyMessage
+        | PermissionRevokeMessage
+        | KickMessage
+        | SimulationStartMessage
+        | SimulationStopMessage
+        | SimulationToggleMessage
+        | SimulationClockTickMessage
+        | SimulationStepMessage
+        | SimulationStateMessage
+    ),
+    Field(discriminator="type"),
 ]
 
+# Built once at import; validates a parsed frame against every variant
+ClientMessageAdapter: Final = TypeAdapter(ClientMessage)
+
+
+def decode_client_frame(data: str | bytes) -> tuple[ClientMessage, dict[str, Any]]:
+    """
+    Parse a raw client frame, returning the validated message and the raw
+    payload dict it was built from.
+
+    Handlers that echo a payload back to the room forward the raw dict
+    instead of dumping the validated model again. Malformed JSON raises
+    orjson.JSONDecodeError; an invalid message raises ValidationError.
+    """
+    raw = orjson.loads(data)
+    message = ClientMessageAdapter.validate_python(raw)
+    return message, raw.get("payload") or {}
+
+
+# Server -> Client Payloads
+class SyncStatePayload(_Payload):
+    """Full circuit and participant snapshot."""
+    circuit: CircuitState
+    participants: list[Participant]
+
+
+class ComponentAddedPayload(_Payload):
+    """Component added broadcast payload."""
+    component: CircuitComponent
+    user_id: str = Field(alias="userId")
+
+
+class ComponentMovedPayload(_Payload):
+    """Component moved broadcast payload."""
+    component_id: str = Field(alias="componentId")
+    position: Position
+    user_id: str = Field(alias="userId")
+
+
+class ComponentDeletedPayload(_Payload):
+    """Component deleted broadcast payload."""
+    component_id: str = Field(alias="componentId")
+    user_id: str = Field(alias="userId")
+
+
+class BatchDeletedPayload(_Payload):
+    """Component and connected wires deleted broadcast payload."""
+    wire_ids: list[str] = Field(alias="wireIds")
+    component_id: str = Field(alias="componentId")
+    user_id: str = Field(alias="userId")
+
+
+class WireAddedPayload(_Payload):
+    """Wire added broadcast payload."""
+    wire: Wire
+    user_id: str = Field(alias="userId")
+
+
+class WireDeletedPayload(_Payload):
+    """Wire deleted broadcast payload."""
+    wire_id: str = Field(alias="wireId")
+    user_id: str = Field(alias="userId")
+
+
+class AnnotationAddedPayload(_Payload):
+    """Annotation added broadcast payload."""
+    annotation: Annotation
+    user_id: str = Field(alias="userId")
+
+
+class AnnotationDeletedPayload(_Payload):
+    """Annotation deleted broadcast payload."""
+    annotation_id: str = Field(alias="annotationId")
+    user_id: str = Field(alias="userId")
+
+
+class StateUpdatedPayload(_Payload):
+    """Circuit version changed (undo/redo) broadcast payload."""
+    version: int
+
+
+class CursorMovedPayload(_Payload):
+    """Cursor moved broadcast payload."""
+    participant_id: str = Field(alias="participantId")
+    position: Position | None = None
+
+
+class SelectionChangedPayload(_Payload):
+    """Selection changed broadcast payload."""
+    participant_id: str = Field(alias="participantId")
+    component_ids: list[str] = Field(alias="componentIds")
+
+
+class ParticipantJoinedPayload(_Payload):
+    """Participant joined broadcast payload."""
+    participant: Participant
+
+
+class EditRequestReceivedPayload(_Payload):
+    """Edit request forwarded to the teacher."""
+    participant_id: str = Field(alias="participantId")
+    display_name: str = Field(alias="displayName")
+
+
+class SimulationStartedPayload(_Payload):
+    """Simulation started broadcast payload."""
+    started_by: str = Field(alias="startedBy")
+    wire_states: dict[str, str] = Field(alias="wireStates")
+    pin_states: dict[str, dict[str, str]] = Field(alias="pinStates")
+
+
+class SimulationStoppedPayload(_Payload):
+    """Simulation stopped broadcast payload."""
+    stopped_by: str = Field(alias="stoppedBy")
+
+
+class CompactWireStates(_Payload):
+    """Wire states as parallel arrays, one signal character per wire."""
+    ids: list[str]
+    states: str
+
+
+class SimulationStateUpdatedPayload(_Payload):
+    """Simulation state updated broadcast payload."""
+    wire_states: CompactWireStates = Field(alias="wireStates")
+    pin_states: dict[str, dict[str, str]] = Field(alias="pinStates")
+
+
+class ErrorPayload(_Payload):
+    """Error message payload."""
+    code: str
+    message: str
+
 
 # Server -> Client Messages
-class SyncStateMessage(BaseModel):
+class SyncStateMessage(_Message):
     """Sync state message."""
     type: Literal["sync:state"] = "sync:state"
-    payload: dict[str, Any]
+    payload: SyncStatePayload
 
 
-class ComponentAddedMessage(BaseModel):
+class ComponentAddedMessage(_Message):
     """Component added broadcast."""
     type: Literal["circuit:component:added"] = "circuit:component:added"
-    payload: dict[str, Any]
+    payload: ComponentAddedPayload
 
 
-class ComponentMovedMessage(BaseModel):
+class ComponentMovedMessage(_Message):
     """Component moved broadcast."""
     type: Literal["circuit:component:moved"] = "circuit:component:moved"
-    payload: dict[str, Any]
+    payload: ComponentMovedPayload
 
 
-class ComponentDeletedMessage(BaseModel):
+class ComponentDeletedMessage(_Message):
     """Component deleted broadcast."""
     type: Literal["circuit:component:deleted"] = "circuit:component:deleted"
-    payload: dict[str, Any]
+    payload: ComponentDeletedPayload
 
 
-class WireAddedMessage(BaseModel):
+class BatchDeletedMessage(_Message):
+    """Component deleted together with its connected wires broadcast."""
+    type: Literal["circuit:batch:deleted"] = "circuit:batch:deleted"
+    payload: BatchDeletedPayload
+
+
+class WireAddedMessage(_Message):
     """Wire added broadcast."""
     type: Literal["circuit:wire:added"] = "circuit:wire:added"
-    payload: dict[str, Any]
+    payload: WireAddedPayload
 
 
-class WireDeletedMessage(BaseModel):
+class WireDeletedMessage(_Message):
     """Wire deleted broadcast."""
     type: Literal["circuit:wire:deleted"] = "circuit:wire:deleted"
-    payload: dict[str, Any]
+    payload: WireDeletedPayload
 
 
-class AnnotationAddedMessage(BaseModel):
+class AnnotationAddedMessage(_Message):
     """Annotation added broadcast."""
     type: Literal["circuit:annotation:added"] = "circuit:annotation:added"
-    payload: dict[str, Any]
+    payload: AnnotationAddedPayload
 
 
-class AnnotationDeletedMessage(BaseModel):
+class AnnotationDeletedMessage(_Message):
     """Annotation deleted broadcast."""
     type: Literal["circuit:annotation:deleted"] = "circuit:annotation:deleted"
-    payload: dict[str, Any]
+    payload: AnnotationDeletedPayload
 
 
-class StateUpdatedMessage(BaseModel):
+class StateUpdatedMessage(_Message):
     """State updated broadcast."""
     type: Literal["circuit:state:updated"] = "circuit:state:updated"
-    payload: dict[str, Any]
+    payload: StateUpdatedPayload
 
 
-class CursorMovedMessage(BaseModel):
+class CursorMovedMessage(_Message):
     """Cursor moved broadcast."""
     type: Literal["presence:cursor:moved"] = "presence:cursor:moved"
-    payload: dict[str, Any]
+    payload: CursorMovedPayload
 
 
-class SelectionChangedMessage(BaseModel):
+class SelectionChangedMessage(_Message):
     """Selection changed broadcast."""
     type: Literal["presence:selection:changed"] = "presence:selection:changed"
-    payload: dict[str, Any]
+    payload: SelectionChangedPayload
 
 
-class ParticipantJoinedMessage(BaseModel):
+class ParticipantJoinedMessage(_Message):
     """Participant joined broadcast."""
     type: Literal["presence:participant:joined"] = "presence:participant:joined"
-    payload: dict[str, Any]
+    payload: ParticipantJoinedPayload
 
 
-class ParticipantLeftMessage(BaseModel):
+class ParticipantLeftMessage(_Message):
     """Participant left broadcast."""
     type: Literal["presence:participant:left"] = "presence:participant:left"
-    payload: dict[str, Any]
+    payload: ParticipantRefPayload
 
 
-class EditRequestReceivedMessage(BaseModel):
+class EditRequestReceivedMessage(_Message):
     """Edit request received broadcast."""
     type: Literal["permission:request:received"] = "permission:request:received"
-    payload: dict[str, Any]
+    payload: EditRequestReceivedPayload
 
 
-class PermissionGrantedMessage(BaseModel):
+class PermissionGrantedMessage(_Message):
     """Permission granted broadcast."""
     type: Literal["permission:granted"] = "permission:granted"
-    payload: dict[str, Any]
+    payload: ParticipantRefPayload
 
 
-class PermissionDeniedMessage(BaseModel):
+class PermissionDeniedMessage(_Message):
     """Permission denied broadcast."""
     type: Literal["permission:denied"] = "permission:denied"
-    payload: dict[str, Any]
+    payload: ParticipantRefPayload
 
 
-class PermissionRevokedMessage(BaseModel):
+class PermissionRevokedMessage(_Message):
     """Permission revoked broadcast."""
     type: Literal["permission:revoked"] = "permission:revoked"
-    payload: dict[str, Any]
+    payload: ParticipantRefPayload
 
 
-class ErrorMessage(BaseModel):
+class ErrorMessage(_Message):
     """Error message."""
     type: Literal["error"] = "error"
-    payload: dict[str, Any]
+    payload: ErrorPayload
 
 
-class SimulationStartedMessage(BaseModel):
+class SimulationStartedMessage(_Message):
     """Simulation started broadcast."""
     type: Literal["simulation:started"] = "simulation:started"
-    payload: dict[str, Any]
+    payload: SimulationStartedPayload
 
 
-class SimulationStoppedMessage(BaseModel):
+class SimulationStoppedMessage(_Message):
     """Simulation stopped broadcast."""
     type: Literal["simulation:stopped"] = "simulation:stopped"
-    payload: dict[str, Any]
+    payload: SimulationStoppedPayload
 
 
-class SimulationStateUpdatedMessage(BaseModel):
+class SimulationStateUpdatedMessage(_Message):
     """Simulation state updated broadcast."""
     type: Literal["simulation:state:updated"] = "simulation:state:updated"
-    payload: dict[str, Any]
-
-
-ServerMessage = Union[
-    SyncStateMessage,
-    ComponentAddedMessage,
-    ComponentMovedMessage,
-    ComponentDeletedMessage,
-    WireAddedMessage,
-    WireDeletedMessage,
-    AnnotationAddedMessage,
-    AnnotationDeletedMessage,
-    StateUpdatedMessage,
-    CursorMovedMessage,
-    SelectionChangedMessage,
-    ParticipantJoinedMessage,
-    ParticipantLeftMessage,
-    EditRequestReceivedMessage,
-    PermissionGrantedMessage,
-    PermissionDeniedMessage,
-    PermissionRevokedMessage,
-    SimulationStartedMessage,
-    SimulationStoppedMessage,
-    SimulationStateUpdatedMessage,
-    ErrorMessage,
+    payload: SimulationStateUpdatedPayload
+
+
+ServerMessage = Annotated[
+    (
+        SyncStateMessage
+        | ComponentAddedMessage
+        | ComponentMovedMessage
+        | ComponentDeletedMessage
+        | BatchDeletedMessage
+        | WireAddedMessage
+        | WireDeletedMessage
+        | AnnotationAddedMessage
+        | AnnotationDeletedMessage
+        | StateUpdatedMessage
+        | CursorMovedMessage
+        | SelectionChangedMessage
+        | ParticipantJoinedMessage
+        | ParticipantLeftMessage
+        | EditRequestReceivedMessage
+        | PermissionGrantedMessage
+        | PermissionDeniedMessage
+        | PermissionRevokedMessage
+        | SimulationStartedMessage
+        | SimulationStoppedMessage
+        | SimulationStateUpdatedMessage
+        | ErrorMessage
+    ),
+    Field(discriminator="type"),
 ]
+
+ServerMessageAdapter: Final = TypeAdapter(ServerMessage)
+
+
+def dump_frame(message: ServerMessage) -> bytes:
+    """Serialize a server message to a camelCase JSON frame with orjson."""
+    return orjson.dumps(message.model_dump(by_alias=True))
@@ -0,0 +1,28 @@
+"""Shared test fixtures."""
+
+from collections.abc import Callable
+
+import pytest
+
+
+class FakeWebSocket:
+    """Records frames sent through the connection writer."""
+
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+        self.close_code: int | None = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_code = code
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.frames.append(data)
+
+
+@pytest.fixture
+def make_websocket() -> Callable[[], FakeWebSocket]:
+    """Factory for fake WebSockets that record the frames sent to them."""
+    return FakeWebSocket
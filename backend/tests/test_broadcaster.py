@@ -0,0 +1,189 @@
+"""Tests for the WebSocket room manager and outbound frame batching."""
+
+import asyncio
+import weakref
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+
+from app.websocket.broadcaster import (
+    MAX_OUTBOX_FRAMES,
+    MAX_QUEUED_FRAMES,
+    SLOW_CLIENT_CLOSE_CODE,
+    ConnectionInfo,
+    RoomManager,
+    room_manager,
+)
+from app.websocket.handler import WebSocketHandler
+
+
+def decode_messages(frames: list[bytes]) -> list[dict]:
+    """Flatten received frames, unwrapping batch envelopes."""
+    messages = []
+    for frame in frames:
+        message = orjson.loads(frame)
+        if message["type"] == "batch":
+            messages.extend(message["payload"])
+        else:
+            messages.append(message)
+    return messages
+
+
+async def test_burst_is_coalesced_into_batch_frame(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """Messages queued while the writer is busy are shipped as one batch."""
+    websocket = make_websocket()
+    conn = ConnectionInfo(websocket, "ABC123", "p1")
+    for i in range(5):
+        conn.send(orjson.dumps({"type": "cursor:moved", "payload": {"i": i}}))
+    conn.start_writer()
+
+    await conn.close()
+
+    assert len(websocket.frames) == 1
+    messages = decode_messages(websocket.frames)
+    assert [m["payload"]["i"] for m in messages] == [0, 1, 2, 3, 4]
+
+
+async def test_idle_connection_sends_frames_individually(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """A single queued message is sent as-is, without a batch envelope."""
+    websocket = make_websocket()
+    manager = RoomManager()
+    await manager.connect(websocket, "ABC123", "p1")
+
+    await manager.broadcast_bytes("ABC123", b'{"type":"error","payload":{}}')
+    await asyncio.sleep(0)
+    await manager.disconnect("p1")
+
+    assert [orjson.loads(f)["type"] for f in websocket.frames] == ["error"]
+    assert not manager.is_connected("p1")
+
+
+async def test_broadcast_serialized_once_for_room(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """Every recipient of a broadcast is sent the same encoded frame."""
+    sockets = [make_websocket(), make_websocket()]
+    for i, websocket in enumerate(sockets):
+        await room_manager.connect(websocket, "ABC123", f"p{i}")
+
+    await WebSocketHandler._broadcast(
+        "ABC123",
+        {"type": "permission:granted", "payload": {"participantId": "p1"}},
+    )
+    await asyncio.sleep(0)
+
+    first, second = (websocket.frames[0] for websocket in sockets)
+    assert first is second
+    assert orjson.loads(first)["payload"] == {"participantId": "p1"}
+    for i in range(len(sockets)):
+        await room_manager.disconnect(f"p{i}")
+
+
+async def test_lossy_stream_held_briefly_for_batching(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """Lossy frames arriving one at a time on an idle connection are batched."""
+    websocket = make_websocket()
+    conn = ConnectionInfo(websocket, "ABC123", "p1")
+    conn.start_writer()
+    for i in range(3):
+        conn.send(
+            orjson.dumps({"type": "presence:cursor:moved", "payload": {"i": i}}),
+            lossy=True,
+        )
+        await asyncio.sleep(0)
+
+    await conn.close()
+
+    assert len(websocket.frames) == 1
+    assert [m["payload"]["i"] for m in decode_messages(websocket.frames)] == [0, 1, 2]
+
+
+async def test_critical_frame_behind_lossy_one_is_not_held(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """A critical frame queued behind a lossy one skips the lossy delay."""
+    websocket = make_websocket()
+    conn = ConnectionInfo(websocket, "ABC123", "p1")
+    conn.send(
+        orjson.dumps({"type": "presence:cursor:moved", "payload": {}}), lossy=True
+    )
+    conn.send(orjson.dumps({"type": "circuit:wire:added", "payload": {}}))
+    conn.start_writer()
+
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert [m["type"] for m in decode_messages(websocket.frames)] == [
+        "presence:cursor:moved",
+        "circuit:wire:added",
+    ]
+    await conn.close()
+
+
+async def test_full_queue_drops_oldest_lossy_frame(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """A slow client's backlog sheds lossy frames but keeps critical ones."""
+    websocket = make_websocket()
+    conn = ConnectionInfo(websocket, "ABC123", "p1")
+    conn.send(orjson.dumps({"type": "circuit:wire:added", "payload": {}}))
+    for i in range(MAX_QUEUED_FRAMES):
+        conn.send(
+            orjson.dumps({"type": "presence:cursor:moved", "payload": {"i": i}}),
+            lossy=True,
+        )
+    conn.send(orjson.dumps({"type": "circuit:wire:deleted", "payload": {}}))
+    conn.start_writer()
+
+    await conn.close()
+
+    messages = decode_messages(websocket.frames)
+    assert len(messages) == MAX_QUEUED_FRAMES
+    assert messages[0]["type"] == "circuit:wire:added"
+    # The two oldest cursor frames made room for the overflowing ones
+    assert messages[1]["payload"]["i"] == 2
+    assert messages[-1]["type"] == "circuit:wire:deleted"
+
+
+async def test_critical_backlog_over_hard_cap_closes_connection(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """A client too far behind on critical frames is dropped, not buffered."""
+    websocket = make_websocket()
+    conn = ConnectionInfo(websocket, "ABC123", "p1")
+    frame = orjson.dumps({"type": "circuit:wire:added", "payload": {}})
+    for _ in range(MAX_OUTBOX_FRAMES):
+        assert conn.send(frame)
+
+    assert not conn.send(frame)
+    assert conn.closed
+    assert not conn.send(frame)
+
+    await asyncio.sleep(0)
+    assert websocket.close_code == SLOW_CLIENT_CLOSE_CODE
+
+
+async def test_room_resources_released_when_room_empties(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """Resources attached to a room are dropped with its last connection."""
+
+    class Resource:
+        pass
+
+    manager = RoomManager()
+    await manager.connect(make_websocket(), "ABC123", "p1")
+    resource = Resource()
+    tracked = weakref.WeakValueDictionary({"ABC123": resource})
+    manager.attach_resource("ABC123", "simulation", resource)
+    del resource
+
+    assert "ABC123" in tracked
+    await manager.disconnect("p1")
+    assert "ABC123" not in tracked
@@ -8,9 +8,9 @@ SHALL produce a circuit state that is equivalent to the original.
 """
 
 from datetime import datetime
-from typing import Any
 
-from hypothesis import given, settings, strategies as st
+from hypothesis import given, settings
+from hypothesis import strategies as st
 
 from app.models.circuit import (
     Annotation,
@@ -27,16 +27,23 @@ from app.models.circuit import (
     Wire,
 )
 
-
 # ============================================================================
 # Hypothesis Strategies for generating valid circuit data
 # ============================================================================
 
+# Character sets shared by the identifier strategies below
+alphanumeric_chars = st.characters(whitelist_categories=("L", "N"))
+letter_chars = st.characters(whitelist_categories=("L",))
+
 # Strategy for generating valid positions
 position_strategy = st.builds(
     Position,
-    x=st.floats(min_value=-10000, max_value=10000, allow_nan=False, allow_infinity=False),
-    y=st.floats(min_value=-10000, max_value=10000, allow_nan=False, allow_infinity=False),
+    x=st.floats(
+        min_value=-10000, max_value=10000, allow_nan=False, allow_infinity=False
+    ),
+    y=st.floats(
+        min_value=-10000, max_value=10000, allow_nan=False, allow_infinity=False
+    ),
 )
 
 # Strategy for generating valid pin types
@@ -45,8 +52,8 @@ pin_type_strategy = st.sampled_from([PinType.INPUT, PinType.OUTPUT])
 # Strategy for generating valid pins
 pin_strategy = st.builds(
     Pin,
-    id=st.text(min_size=1, max_size=36, alphabet=st.characters(whitelist_categories=("L", "N"))),
-    name=st.text(min_size=1, max_size=20, alphabet=st.characters(whitelist_categories=("L", "N"))),
+    id=st.text(min_size=1, max_size=36, alphabet=alphanumeric_chars),
+    name=st.text(min_size=1, max_size=20, alphabet=alphanumeric_chars),
     type=pin_type_strategy,
     position=position_strategy,
 )
@@ -59,10 +66,12 @@ rotation_strategy = st.sampled_from(list(Rotation))
 
 # Strategy for generating valid component properties
 properties_strategy = st.dictionaries(
-    keys=st.text(min_size=1, max_size=20, alphabet=st.characters(whitelist_categories=("L",))),
+    keys=st.text(min_size=1, max_size=20, alphabet=letter_chars),
     values=st.one_of(
         st.integers(min_value=-1000, max_value=1000),
-        st.floats(min_value=-1000, max_value=1000, allow_nan=False, allow_infinity=False),
+        st.floats(
+            min_value=-1000, max_value=1000, allow_nan=False, allow_infinity=False
+        ),
         st.booleans(),
         st.text(min_size=0, max_size=50),
     ),
@@ -81,36 +90,22 @@ circuit_component_strategy = st.builds(
     pins=st.lists(pin_strategy, min_size=0, max_size=8),
 )
 
-# Strategy for generating valid wires (requires component IDs)
-def wire_strategy_for_components(component_ids: list[str]) -> st.SearchStrategy[Wire]:
-    """Generate wires that reference existing component IDs."""
-    if len(component_ids) < 2:
-        return st.just(None)  # type: ignore
-    
-    return st.builds(
-        Wire,
-        id=st.uuids().map(str),
-        fromComponentId=st.sampled_from(component_ids),
-        fromPinId=st.text(min_size=1, max_size=10, alphabet=st.characters(whitelist_categories=("L", "N"))),
-        toComponentId=st.sampled_from(component_ids),
-        toPinId=st.text(min_size=1, max_size=10, alphabet=st.characters(whitelist_categories=("L", "N"))),
-        waypoints=st.lists(position_strategy, min_size=0, max_size=10),
-    )
-
 # Strategy for stroke widths
 stroke_width_strategy = st.sampled_from(list(StrokeWidth))
 
 # Strategy for annotation colors (8 colors from requirements)
-annotation_color_strategy = st.sampled_from([
-    "#000000",  # black
-    "#EF4444",  # red
-    "#3B82F6",  # blue
-    "#22C55E",  # green
-    "#F97316",  # orange
-    "#A855F7",  # purple
-    "#92400E",  # brown
-    "#FFFFFF",  # white
-])
+annotation_color_strategy = st.sampled_from(
+    [
+        "#000000",  # black
+        "#EF4444",  # red
+        "#3B82F6",  # blue
+        "#22C55E",  # green
+        "#F97316",  # orange
+        "#A855F7",  # purple
+        "#92400E",  # brown
+        "#FFFFFF",  # white
+    ]
+)
 
 # Strategy for stroke data
 stroke_data_strategy = st.builds(
@@ -125,7 +120,9 @@ text_data_strategy = st.builds(
     TextData,
     content=st.text(min_size=1, max_size=200),
     position=position_strategy,
-    fontSize=st.floats(min_value=8, max_value=72, allow_nan=False, allow_infinity=False),
+    fontSize=st.floats(
+        min_value=8, max_value=72, allow_nan=False, allow_infinity=False
+    ),
 )
 
 # Strategy for annotations
@@ -146,27 +143,33 @@ annotation_strategy = st.one_of(
     ),
 )
 
-# Strategy for valid session IDs (6-char uppercase alphanumeric)
-session_id_strategy = st.text(
-    min_size=6,
-    max_size=6,
-    alphabet="ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789",
+# Strategy for session IDs: generated 6-character alphanumerics of either
+# case, plus a few representative codes
+session_id_strategy = st.one_of(
+    st.text(
+        min_size=6,
+        max_size=6,
+        alphabet="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+    ),
+    st.sampled_from(["ABC123", "000000", "ZZZZZZ"]),
 )
 
-# Strategy for schema versions (semver format)
-schema_version_strategy = st.builds(
-    lambda major, minor, patch: f"{major}.{minor}.{patch}",
-    major=st.integers(min_value=0, max_value=99),
-    minor=st.integers(min_value=0, max_value=99),
-    patch=st.integers(min_value=0, max_value=99),
+# Strategy for schema versions (semver format), including large components
+schema_version_strategy = st.one_of(
+    st.tuples(
+        st.integers(min_value=0, max_value=10_000),
+        st.integers(min_value=0, max_value=10_000),
+        st.integers(min_value=0, max_value=10_000),
+    ).map(lambda parts: ".".join(map(str, parts))),
+    st.sampled_from(["0.0.0", "1.0.0"]),
 )
 
 
-
 # ============================================================================
 # Property-Based Tests
 # ============================================================================
 
+
 @given(
     session_id=session_id_strategy,
     version=st.integers(min_value=0, max_value=10000),
@@ -185,71 +188,50 @@ def test_circuit_state_serialization_round_trip(
     """
     **Feature: circuit-forge, Property 9: Circuit State Serialization Round-Trip**
     **Validates: Requirements 14.1, 14.2, 14.3**
-    
+
     For any valid circuit state, serializing to JSON and then deserializing
     SHALL produce a circuit state that is equivalent to the original.
     """
     # Get component IDs for wire generation
     component_ids = [c.id for c in components]
-    
+
     # Generate wires that reference existing components
     wires: list[Wire] = []
     if len(component_ids) >= 2:
         # Create a few wires between components
         for i in range(min(3, len(component_ids) - 1)):
-            wire = Wire(
+            wire = Wire.model_construct(
                 id=f"wire-{i}",
-                fromComponentId=component_ids[i],
-                fromPinId=f"out-{i}",
-                toComponentId=component_ids[(i + 1) % len(component_ids)],
-                toPinId=f"in-{i}",
+                from_component_id=component_ids[i],
+                from_pin_id=f"out-{i}",
+                to_component_id=component_ids[(i + 1) % len(component_ids)],
+                to_pin_id=f"in-{i}",
                 waypoints=[],
             )
             wires.append(wire)
-    
-    # Create the original circuit state
-    original = CircuitState(
-        sessionId=session_id,
+
+    # Create the original circuit state; its parts are already valid models,
+    # so skip validation here and only validate on the deserialized side
+    original = CircuitState.model_construct(
+        session_id=session_id,
         version=version,
-        schemaVersion=schema_version,
+        schema_version=schema_version,
         components=components,
         wires=wires,
         annotations=annotations,
-        updatedAt=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
     )
-    
-    # Serialize to JSON (using model_dump with by_alias for camelCase)
-    json_data = original.model_dump(mode="json", by_alias=True)
-    
+
+    # Serialize to JSON (with by_alias for camelCase)
+    json_data = original.model_dump_json(by_alias=True)
+
     # Deserialize back to CircuitState
-    deserialized = CircuitState.model_validate(json_data)
-    
+    deserialized = CircuitState.model_validate_json(json_data)
+
     # Verify equivalence (excluding updatedAt which may have microsecond differences)
-    assert deserialized.session_id == original.session_id
-    assert deserialized.version == original.version
-    assert deserialized.schema_version == original.schema_version
-    assert len(deserialized.components) == len(original.components)
-    assert len(deserialized.wires) == len(original.wires)
-    assert len(deserialized.annotations) == len(original.annotations)
-    
-    # Verify components
-    for orig_comp, deser_comp in zip(original.components, deserialized.components):
-        assert deser_comp.id == orig_comp.id
-        assert deser_comp.type == orig_comp.type
-        assert deser_comp.position.x == orig_comp.position.x
-        assert deser_comp.position.y == orig_comp.position.y
-        assert deser_comp.rotation == orig_comp.rotation
-        assert deser_comp.properties == orig_comp.properties
-        assert len(deser_comp.pins) == len(orig_comp.pins)
-    
-    # Verify wires
-    for orig_wire, deser_wire in zip(original.wires, deserialized.wires):
-        assert deser_wire.id == orig_wire.id
-        assert deser_wire.from_component_id == orig_wire.from_component_id
-        assert deser_wire.from_pin_id == orig_wire.from_pin_id
-        assert deser_wire.to_component_id == orig_wire.to_component_id
-        assert deser_wire.to_pin_id == orig_wire.to_pin_id
-        assert len(deser_wire.waypoints) == len(orig_wire.waypoints)
+    assert deserialized.model_dump_json(
+        by_alias=True, exclude={"updated_at"}
+    ) == original.model_dump_json(by_alias=True, exclude={"updated_at"})
 
 
 @given(
@@ -264,11 +246,11 @@ def test_component_serialization_round_trip(
     """
     for original in components:
         # Serialize
-        json_data = original.model_dump(mode="json", by_alias=True)
-        
+        json_data = original.model_dump_json(by_alias=True)
+
         # Deserialize
-        deserialized = CircuitComponent.model_validate(json_data)
-        
+        deserialized = CircuitComponent.model_validate_json(json_data)
+
         # Verify
         assert deserialized.id == original.id
         assert deserialized.type == original.type
@@ -287,11 +269,11 @@ def test_annotation_serialization_round_trip(
     """
     for original in annotations:
         # Serialize
-        json_data = original.model_dump(mode="json", by_alias=True)
-        
+        json_data = original.model_dump_json(by_alias=True)
+
         # Deserialize
-        deserialized = Annotation.model_validate(json_data)
-        
+        deserialized = Annotation.model_validate_json(json_data)
+
         # Verify
         assert deserialized.id == original.id
         assert deserialized.type == original.type
@@ -0,0 +1,92 @@
+"""Tests for WebSocket message routing in the connection handler."""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+
+from app.models.session import Participant, Role
+from app.websocket.broadcaster import room_manager
+from app.websocket.handler import WebSocketHandler
+from app.websocket.messages import decode_client_frame
+
+
+async def test_edit_refused_from_connection_permission(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """Circuit edits are checked against the connection's can_edit flag."""
+    websocket = make_websocket()
+    conn = await room_manager.connect(websocket, "ABC123", "s1")
+    message, raw_payload = decode_client_frame(
+        b'{"type":"circuit:wire:delete","payload":{"wireId":"w1"}}'
+    )
+
+    await WebSocketHandler()._handle_message("ABC123", "s1", message, raw_payload)
+    await room_manager.disconnect("s1")
+
+    error = orjson.loads(websocket.frames[0])
+    assert conn.can_edit is False
+    assert error["type"] == "error"
+    assert error["payload"]["code"] == "FORBIDDEN"
+
+
+class FailingJoinSessionService:
+    """Session service whose mark-active step fails after the room join."""
+
+    def __init__(self, participant: Any) -> None:
+        self.participant = participant
+        self.marked_inactive = False
+
+    async def get_session(self, *_: str) -> None:
+        pass
+
+    async def get_participant(self, *_: str) -> Any:
+        return self.participant
+
+    async def mark_participant_active(self, *_: str) -> None:
+        raise RuntimeError("database unavailable")
+
+    async def mark_participant_inactive(self, *_: str) -> None:
+        self.marked_inactive = True
+
+
+class StalledCircuitService:
+    """Circuit service whose snapshot load never finishes."""
+
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    async def get_latest_version(self, *_: str) -> int:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return 0
+
+
+async def test_failed_join_disconnects_and_cancels_snapshot(
+    make_websocket: Callable[[], Any],
+) -> None:
+    """A failure after joining the room still runs the disconnect cleanup."""
+    participant = Participant(
+        id="s1",
+        sessionCode="ABC123",
+        displayName="Student",
+        role=Role.STUDENT,
+        canEdit=False,
+        color="#000000",
+    )
+    handler = WebSocketHandler()
+    session_service = FailingJoinSessionService(participant)
+    circuit_service = StalledCircuitService()
+    handler._session_service = session_service
+    handler._circuit_service = circuit_service
+
+    await handler.handle_connection(make_websocket(), "ABC123", "s1")
+    await asyncio.sleep(0)
+
+    assert not room_manager.is_connected("s1")
+    assert circuit_service.cancelled
+    assert session_service.marked_inactive
@@ -0,0 +1,99 @@
+"""Tests for WebSocket message decoding."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.websocket.messages import (
+    ClientMessageAdapter,
+    ComponentMoveMessage,
+    CursorMoveMessage,
+    ParticipantRefPayload,
+    PermissionGrantedMessage,
+    ServerMessageAdapter,
+    decode_client_frame,
+    dump_frame,
+)
+
+
+def test_decode_dispatches_on_type_tag() -> None:
+    """The message variant is selected by the type field."""
+    message, _ = decode_client_frame(
+        b'{"type":"circuit:component:move",'
+        b'"payload":{"componentId":"c1","position":{"x":1,"y":2}}}'
+    )
+
+    assert isinstance(message, ComponentMoveMessage)
+    assert message.payload.component_id == "c1"
+    assert message.payload.position.x == 1
+
+
+def test_decode_cursor_move() -> None:
+    """High-frequency presence frames decode to their own variant."""
+    message, _ = decode_client_frame(
+        '{"type":"presence:cursor:move","payload":{"position":{"x":3,"y":4}}}'
+    )
+
+    assert isinstance(message, CursorMoveMessage)
+
+
+def test_decode_rejects_unknown_type() -> None:
+    """Unknown tags fail fast instead of trying every variant."""
+    with pytest.raises(ValidationError) as exc_info:
+        ClientMessageAdapter.validate_json(b'{"type":"circuit:explode","payload":{}}')
+
+    assert exc_info.value.errors()[0]["type"] == "union_tag_invalid"
+
+
+def test_payload_fields_are_typed() -> None:
+    """Payloads are validated field by field, not accepted as free-form dicts."""
+    message, _ = decode_client_frame(
+        b'{"type":"permission:approve","payload":{"participantId":"p1"}}'
+    )
+    assert message.payload.participant_id == "p1"
+
+    with pytest.raises(ValidationError):
+        decode_client_frame(b'{"type":"circuit:wire:delete","payload":{}}')
+
+
+def test_decode_client_frame_keeps_raw_payload() -> None:
+    """The raw payload dict is returned alongside the validated message."""
+    message, raw_payload = decode_client_frame(
+        b'{"type":"circuit:component:move",'
+        b'"payload":{"componentId":"c1","position":{"x":1,"y":2}}}'
+    )
+
+    assert isinstance(message, ComponentMoveMessage)
+    assert raw_payload == {"componentId": "c1", "position": {"x": 1, "y": 2}}
+
+    _, raw_payload = decode_client_frame(b'{"type":"circuit:undo"}')
+    assert raw_payload == {}
+
+
+def test_dump_frame_uses_camel_case_aliases() -> None:
+    """Outbound frames use the same field names the frontend expects."""
+    message = PermissionGrantedMessage(
+        payload=ParticipantRefPayload(participantId="p1")
+    )
+
+    assert dump_frame(message) == (
+        b'{"type":"permission:granted","payload":{"participantId":"p1"}}'
+    )
+
+
+def test_server_frames_round_trip() -> None:
+    """Encoded server frames decode back to the same message model."""
+    message = PermissionGrantedMessage(
+        payload=ParticipantRefPayload(participantId="p1")
+    )
+
+    assert ServerMessageAdapter.validate_json(dump_frame(message)) == message
+
+
+def test_message_envelopes_are_frozen_and_closed() -> None:
+    """Envelopes reject unknown top-level keys and cannot be mutated."""
+    with pytest.raises(ValidationError):
+        decode_client_frame(b'{"type":"circuit:undo","payload":{},"extra":1}')
+
+    message, _ = decode_client_frame(b'{"type":"circuit:undo"}')
+    with pytest.raises(ValidationError):
+        message.type = "circuit:redo"
@@ -7,23 +7,31 @@ For any serialized circuit state JSON, the output SHALL contain a schemaVersion
 field with a valid semantic version string.
 """
 
-import re
 from datetime import datetime
 
-from hypothesis import given, settings, strategies as st
+from hypothesis import given, settings
+from hypothesis import strategies as st
 
 from app.models.circuit import (
+    SCHEMA_VERSION,
     CircuitComponent,
     CircuitState,
     ComponentType,
     Position,
     Rotation,
-    SCHEMA_VERSION,
 )
 
+# The timestamp plays no part in schema versioning, so every example shares one
+FIXED_TIMESTAMP = datetime(2024, 1, 1)
 
-# Semver regex pattern
-SEMVER_PATTERN = re.compile(r"^\d+\.\d+\.\d+$")
+
+def is_semver(version: str) -> bool:
+    """Whether a version is MAJOR.MINOR.PATCH with no leading zeros."""
+    parts = version.split(".")
+    return len(parts) == 3 and all(
+        part.isascii() and part.isdigit() and (part == "0" or part[0] != "0")
+        for part in parts
+    )
 
 
 # Strategy for valid session IDs (6-char uppercase alphanumeric)
@@ -36,8 +44,12 @@ session_id_strategy = st.text(
 # Strategy for generating valid positions
 position_strategy = st.builds(
     Position,
-    x=st.floats(min_value=-10000, max_value=10000, allow_nan=False, allow_infinity=False),
-    y=st.floats(min_value=-10000, max_value=10000, allow_nan=False, allow_infinity=False),
+    x=st.floats(
+        min_value=-10000, max_value=10000, allow_nan=False, allow_infinity=False
+    ),
+    y=st.floats(
+        min_value=-10000, max_value=10000, allow_nan=False, allow_infinity=False
+    ),
 )
 
 # Strategy for generating valid component types
@@ -72,31 +84,35 @@ def test_schema_version_inclusion(
     """
     **Feature: circuit-forge, Property 10: Schema Version Inclusion**
     **Validates: Requirements 14.4**
-    
+
     For any serialized circuit state JSON, the output SHALL contain a
     schemaVersion field with a valid semantic version string.
     """
-    # Create circuit state
-    circuit_state = CircuitState(
-        sessionId=session_id,
+    # Create circuit state (the generated components are already validated)
+    circuit_state = CircuitState.model_construct(
+        session_id=session_id,
         version=version,
-        schemaVersion=SCHEMA_VERSION,
+        schema_version=SCHEMA_VERSION,
         components=components,
         wires=[],
         annotations=[],
-        updatedAt=datetime.utcnow(),
+        updated_at=FIXED_TIMESTAMP,
     )
-    
+
     # Serialize to JSON
     json_data = circuit_state.model_dump(mode="json", by_alias=True)
-    
+
     # Verify schemaVersion field exists
-    assert "schemaVersion" in json_data, "schemaVersion field must be present in serialized JSON"
-    
+    assert (
+        "schemaVersion" in json_data
+    ), "schemaVersion field must be present in serialized JSON"
+
     # Verify schemaVersion is a valid semver string
     schema_version = json_data["schemaVersion"]
     assert isinstance(schema_version, str), "schemaVersion must be a string"
-    assert SEMVER_PATTERN.match(schema_version), f"schemaVersion '{schema_version}' must match semver format (X.Y.Z)"
+    assert is_semver(
+        schema_version
+    ), f"schemaVersion '{schema_version}' must match semver format (X.Y.Z)"
 
 
 @given(session_id=session_id_strategy)
@@ -107,13 +123,13 @@ def test_empty_circuit_has_schema_version(session_id: str) -> None:
     """
     # Create empty circuit state using factory method
     circuit_state = CircuitState.create_empty(session_id)
-    
+
     # Serialize to JSON
     json_data = circuit_state.model_dump(mode="json", by_alias=True)
-    
+
     # Verify schemaVersion field exists and is valid
     assert "schemaVersion" in json_data
-    assert SEMVER_PATTERN.match(json_data["schemaVersion"])
+    assert is_semver(json_data["schemaVersion"])
     assert json_data["schemaVersion"] == SCHEMA_VERSION
 
 
@@ -126,21 +142,22 @@ def test_custom_schema_version_preserved(session_id: str, custom_version: str) -
     """
     Test that custom schema versions are preserved through serialization.
     """
-    # Create circuit state with custom schema version
-    circuit_state = CircuitState(
-        sessionId=session_id,
+    # Create circuit state with custom schema version; only the deserialized
+    # copy needs validating
+    circuit_state = CircuitState.model_construct(
+        session_id=session_id,
         version=0,
-        schemaVersion=custom_version,
+        schema_version=custom_version,
         components=[],
         wires=[],
         annotations=[],
-        updatedAt=datetime.utcnow(),
+        updated_at=FIXED_TIMESTAMP,
     )
-    
+
     # Serialize and deserialize
-    json_data = circuit_state.model_dump(mode="json", by_alias=True)
-    deserialized = CircuitState.model_validate(json_data)
-    
+    json_data = circuit_state.model_dump_json(by_alias=True)
+    deserialized = CircuitState.model_validate_json(json_data)
+
     # Verify schema version is preserved
     assert deserialized.schema_version == custom_version
-    assert json_data["schemaVersion"] == custom_version
+    assert f'"schemaVersion":"{custom_version}"' in json_data
@@ -0,0 +1,227 @@
+"""Tests for the topological circuit simulation service."""
+
+import pytest
+
+from app.models.circuit import (
+    CircuitComponent,
+    CircuitState,
+    ComponentType,
+    Pin,
+    PinType,
+    Position,
+    Wire,
+)
+from app.services.simulation_service import SignalState, SimulationService
+
+ORIGIN = Position(x=0, y=0)
+
+
+def make_component(
+    comp_id: str,
+    comp_type: ComponentType,
+    inputs: tuple[str, ...] = (),
+    outputs: tuple[str, ...] = (),
+    **properties,
+) -> CircuitComponent:
+    """Build a component with the given input/output pin IDs."""
+    pins = [Pin(id=p, name=p, type=PinType.INPUT, position=ORIGIN) for p in inputs]
+    pins += [Pin(id=p, name=p, type=PinType.OUTPUT, position=ORIGIN) for p in outputs]
+    return CircuitComponent(
+        id=comp_id,
+        type=comp_type,
+        position=ORIGIN,
+        properties=properties,
+        pins=pins,
+    )
+
+
+def make_wire(wire_id: str, src: str, src_pin: str, dst: str, dst_pin: str) -> Wire:
+    """Build a wire between two component pins."""
+    return Wire(
+        id=wire_id,
+        fromComponentId=src,
+        fromPinId=src_pin,
+        toComponentId=dst,
+        toPinId=dst_pin,
+    )
+
+
+def make_circuit(components: list[CircuitComponent], wires: list[Wire]) -> CircuitState:
+    """Wrap components and wires in a circuit state."""
+    return CircuitState(sessionId="ABC123", components=components, wires=wires)
+
+
+def and_gate_circuit(a_on: bool, b_on: bool) -> CircuitState:
+    """Two switches driving an AND gate which drives an LED."""
+    return make_circuit(
+        [
+            make_component(
+                "sw1", ComponentType.SWITCH_TOGGLE, outputs=("out",), state=a_on
+            ),
+            make_component(
+                "sw2", ComponentType.SWITCH_TOGGLE, outputs=("out",), state=b_on
+            ),
+            make_component(
+                "and", ComponentType.AND_2, inputs=("a", "b"), outputs=("y",)
+            ),
+            make_component("led", ComponentType.LED_RED, inputs=("in",)),
+        ],
+        [
+            make_wire("w1", "sw1", "out", "and", "a"),
+            make_wire("w2", "sw2", "out", "and", "b"),
+            make_wire("w3", "and", "y", "led", "in"),
+        ],
+    )
+
+
+def test_and_gate_propagates_to_led() -> None:
+    """Signals flow from inputs through gates to output devices."""
+    service = SimulationService()
+
+    result = service.simulate(and_gate_circuit(True, True))
+    assert result.success
+    assert result.wire_states["w3"] == SignalState.HIGH
+    assert result.pin_states["led"]["in"] == SignalState.HIGH
+
+    result = service.simulate(and_gate_circuit(True, False))
+    assert result.success
+    assert result.wire_states["w3"] == SignalState.LOW
+
+
+@pytest.mark.parametrize(
+    ("gate", "a_on", "b_on", "expected"),
+    [
+        (ComponentType.OR_2, False, True, SignalState.HIGH),
+        (ComponentType.NAND_2, True, True, SignalState.LOW),
+        (ComponentType.NOR_2, False, False, SignalState.HIGH),
+        (ComponentType.XOR_2, True, False, SignalState.HIGH),
+        (ComponentType.XNOR_2, True, False, SignalState.LOW),
+    ],
+)
+def test_two_input_gate_dispatch(
+    gate: ComponentType, a_on: bool, b_on: bool, expected: SignalState
+) -> None:
+    """Each gate family dispatches to the matching evaluator."""
+    circuit = and_gate_circuit(a_on, b_on)
+    circuit.components[2].type = gate
+
+    result = SimulationService().simulate(circuit)
+
+    assert result.wire_states["w3"] == expected
+
+
+def test_result_payload_uses_state_names() -> None:
+    """Integer signal states are converted to names at the payload boundary."""
+    payload = SimulationService().simulate(and_gate_circuit(True, True)).to_payload()
+
+    assert payload["wireStates"] == {"w1": "HIGH", "w2": "HIGH", "w3": "HIGH"}
+    assert payload["pinStates"]["led"] == {"in": "HIGH"}
+    assert payload["errors"] == []
+
+
+def test_simulate_delta_matches_full_simulation() -> None:
+    """Re-evaluating only the downstream cone gives the same result as a full run."""
+    service = SimulationService()
+    service.simulate(and_gate_circuit(True, False))
+
+    toggled = and_gate_circuit(True, True)
+    delta = service.simulate_delta(toggled, ["sw2"])
+    full = SimulationService().simulate(toggled)
+
+    assert delta.success
+    assert delta.wire_states == full.wire_states
+    assert delta.pin_states == full.pin_states
+
+
+def test_state_buffers_reused_for_unchanged_topology() -> None:
+    """Re-simulating the same topology overwrites the previous buffers in place."""
+    service = SimulationService()
+    first = service.simulate(and_gate_circuit(True, True))
+    snapshot = first.copy()
+
+    second = service.simulate(and_gate_circuit(False, True))
+
+    assert second.wire_states is first.wire_states
+    assert second.wire_states["w3"] == SignalState.LOW
+    assert snapshot.wire_states["w3"] == SignalState.HIGH
+
+
+def test_validation_skipped_when_topology_cached(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Validation runs only when the circuit structure changes."""
+    service = SimulationService()
+    service.simulate(and_gate_circuit(True, True))
+
+    def fail_validation(_circuit: CircuitState) -> list:
+        raise AssertionError("validation should be cached")
+
+    monkeypatch.setattr(service, "_validate_circuit", fail_validation)
+    result = service.simulate(and_gate_circuit(False, False))
+
+    assert result.success
+    assert result.wire_states["w3"] == SignalState.LOW
+
+
+def test_renamed_pin_revalidated() -> None:
+    """Renaming a pin changes the signature, so errors quote the new name."""
+    service = SimulationService()
+    led = make_component("led", ComponentType.LED_RED, inputs=("in",))
+    service.simulate(make_circuit([led], []))
+
+    led.pins[0].name = "anode"
+    result = service.simulate(make_circuit([led], []))
+
+    assert [e.message for e in result.errors] == [
+        "Floating Input: Input pin 'anode' has no connection"
+    ]
+
+
+def test_cycle_detection_reports_all_cycles() -> None:
+    """Every feedback loop is reported in one pass with its component IDs."""
+    circuit = make_circuit(
+        [
+            make_component("n1", ComponentType.NOT, inputs=("a",), outputs=("y",)),
+            make_component("n2", ComponentType.NOT, inputs=("a",), outputs=("y",)),
+            make_component("n3", ComponentType.NOT, inputs=("a",), outputs=("y",)),
+            make_component("b1", ComponentType.BUFFER, inputs=("a",), outputs=("y",)),
+        ],
+        [
+            make_wire("w1", "n1", "y", "n2", "a"),
+            make_wire("w2", "n2", "y", "n1", "a"),
+            make_wire("w3", "n3", "y", "n3", "a"),
+            make_wire("w4", "n2", "y", "b1", "a"),
+        ],
+    )
+
+    result = SimulationService().simulate(circuit)
+
+    assert not result.success
+    assert all(e.error_type == "CYCLE_DETECTED" for e in result.errors)
+    assert len(result.errors) == 2
+    assert {e.component_id for e in result.errors} <= {"n1", "n2", "n3"}
+    assert any("n1" in e.message and "n2" in e.message for e in result.errors)
+    assert any("n3" in e.message for e in result.errors)
+
+
+def test_output_conflict_reported_once_per_pin() -> None:
+    """An input pin driven by two different outputs is a conflict."""
+    circuit = make_circuit(
+        [
+            make_component("hi", ComponentType.CONST_HIGH, outputs=("out",)),
+            make_component("lo", ComponentType.CONST_LOW, outputs=("out",)),
+            make_component("led", ComponentType.LED_RED, inputs=("in",)),
+        ],
+        [
+            make_wire("w1", "hi", "out", "led", "in"),
+            make_wire("w2", "lo", "out", "led", "in"),
+            make_wire("w3", "lo", "out", "led", "in"),
+        ],
+    )
+
+    result = SimulationService().simulate(circuit)
+
+    assert not result.success
+    assert [(e.error_type, e.component_id, e.pin_id) for e in result.errors] == [
+        ("OUTPUT_CONFLICT", "led", "in")
+    ]
@@ -5,15 +5,25 @@ Supports: Ollama, LM Studio, vLLM, LocalAI, and any OpenAI-compatible server.
 """
 
 import argparse
-import json
+import hmac
+import queue
 import re
 import secrets
+import shutil
+import socket
 import subprocess
 import sys
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from threading import Thread
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+from urllib.request import urlopen
+
+try:  # Optional faster parser; both accept the raw response bytes
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 __version__ = "1.0.0"
 
@@ -26,15 +36,32 @@ LLM_SERVERS = [
     {"name": "Jan", "port": 1337, "models_path": "/v1/models", "key": "data", "name_field": "id"},
     {"name": "text-gen-webui", "port": 5000, "models_path": "/v1/models", "key": "data", "name_field": "id"},
 ]
+for _server in LLM_SERVERS:
+    _server["url"] = f"http://localhost:{_server['port']}{_server['models_path']}"
+
+# Cloudflare prints the quick-tunnel URL early in its startup log
+TUNNEL_URL_PATTERN = re.compile(rb"https://[^\s]+\.trycloudflare\.com")
+TUNNEL_URL_TIMEOUT = 30.0
+TUNNEL_URL_MAX_LINES = 200
+
+# Chunk size for streaming request and response bodies through the proxy
+PROXY_CHUNK_SIZE = 64 * 1024
 
 # Global state
 BRIDGE_TOKEN: str = ""
+BRIDGE_TOKEN_BYTES: bytes = b""
 TARGET_PORT: int = 0
 
 
 class TokenProxyHandler(BaseHTTPRequestHandler):
     """HTTP handler that validates token and proxies requests to local LLM."""
 
+    CORS_HEADERS = (
+        ("Access-Control-Allow-Origin", "*"),
+        ("Access-Control-Allow-Methods", "GET, POST, OPTIONS"),
+        ("Access-Control-Allow-Headers", "Content-Type, X-Bridge-Token"),
+    )
+
     def do_POST(self) -> None:
         if not self._validate_token():
             return
@@ -51,51 +78,82 @@ class TokenProxyHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def _validate_token(self) -> bool:
-        token = self.headers.get("X-Bridge-Token", "")
-        if token != BRIDGE_TOKEN:
+        token = self.headers.get("X-Bridge-Token", "").encode("utf-8", "surrogateescape")
+        if not hmac.compare_digest(token, BRIDGE_TOKEN_BYTES):
             self.send_error(401, "Invalid or missing bridge token")
             return False
         return True
 
     def _send_cors_headers(self) -> None:
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type, X-Bridge-Token")
+        for name, value in self.CORS_HEADERS:
+            self.send_header(name, value)
 
     def _proxy_request(self) -> None:
+        """Forward the request, streaming both bodies in fixed-size chunks."""
         content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length) if content_length else None
-
-        target_url = f"http://localhost:{TARGET_PORT}{self.path}"
         headers = {"Content-Type": self.headers.get("Content-Type", "application/json")}
+        body = None
+        if content_length:
+            headers["Content-Length"] = str(content_length)
+            body = self._iter_body(content_length)
 
-        req = Request(target_url, data=body, headers=headers, method=self.command)
-
+        conn = HTTPConnection("localhost", TARGET_PORT, timeout=120)
+        streaming = False
         try:
-            with urlopen(req, timeout=120) as resp:
-                response_data = resp.read()
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json")
-                self._send_cors_headers()
-                self.end_headers()
-                self.wfile.write(response_data)
-        except URLError as e:
-            self.send_error(502, f"Failed to reach local LLM: {e.reason}")
+            conn.request(self.command, self.path, body=body, headers=headers)
+            resp = conn.getresponse()
+            if resp.status >= 400:
+                self.send_error(502, f"Failed to reach local LLM: {resp.reason}")
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", resp.getheader("Content-Type", "application/json"))
+            self._send_cors_headers()
+            self.end_headers()
+            streaming = True
+            shutil.copyfileobj(resp, self.wfile, PROXY_CHUNK_SIZE)
+        except OSError as e:
+            # Once the body has started there is no way to report an error
+            if not streaming:
+                self.send_error(502, f"Failed to reach local LLM: {e}")
         except Exception as e:
-            self.send_error(500, str(e))
+            if not streaming:
+                self.send_error(500, str(e))
+        finally:
+            conn.close()
+
+    def _iter_body(self, remaining: int) -> Iterator[bytes]:
+        """Yield the request body in chunks without reading past its end."""
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, PROXY_CHUNK_SIZE))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
 
     def log_message(self, format: str, *args) -> None:
         pass  # Suppress default logging
 
 
-def check_server(port: int, models_path: str, key: str, name_field: str) -> list[str] | None:
+def port_open(port: int, timeout: float = 0.05) -> bool:
+    """Check whether anything accepts TCP connections on a local port."""
+    try:
+        with socket.create_connection(("localhost", port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def check_server(server: dict) -> list[str] | None:
     """Check if an LLM server is running and return available models."""
+    # Skip the HTTP probe entirely when nothing is listening
+    if not port_open(server["port"]):
+        return None
     try:
-        url = f"http://localhost:{port}{models_path}"
-        with urlopen(url, timeout=2) as resp:
-            data = json.loads(resp.read().decode())
-            models = data.get(key, [])
+        with urlopen(server["url"], timeout=2) as resp:
+            data = json_loads(resp.read())
+            models = data.get(server["key"], [])
             if models and isinstance(models[0], dict):
+                name_field = server["name_field"]
                 return [m.get(name_field, "unknown") for m in models]
             return list(models) if models else []
     except Exception:
@@ -103,18 +161,13 @@ def check_server(port: int, models_path: str, key: str, name_field: str) -> list
 
 
 def scan_servers() -> list[dict]:
-    """Scan for running LLM servers on common ports."""
-    found = []
-    for server in LLM_SERVERS:
-        models = check_server(
-            server["port"],
-            server["models_path"],
-            server["key"],
-            server["name_field"],
-        )
-        if models is not None:
-            found.append({**server, "models": models})
-    return found
+    """Scan for running LLM servers on common ports (all probed at once)."""
+    with ThreadPoolExecutor(max_workers=len(LLM_SERVERS)) as executor:
+        return [
+            {**server, "models": models}
+            for server, models in zip(LLM_SERVERS, executor.map(check_server, LLM_SERVERS))
+            if models is not None
+        ]
 
 
 def check_cloudflared() -> bool:
@@ -154,9 +207,15 @@ def print_no_servers_found() -> None:
     print()
 
 
-def start_proxy_server() -> tuple[HTTPServer, int]:
+class ProxyServer(ThreadingHTTPServer):
+    """Proxy server handling each request on its own daemon thread."""
+
+    request_queue_size = 32
+
+
+def start_proxy_server() -> tuple[ProxyServer, int]:
     """Start the token-validating proxy server."""
-    server = HTTPServer(("127.0.0.1", 0), TokenProxyHandler)
+    server = ProxyServer(("127.0.0.1", 0), TokenProxyHandler)
     port = server.server_address[1]
     thread = Thread(target=server.serve_forever, daemon=True)
     thread.start()
@@ -168,25 +227,46 @@ def start_tunnel(proxy_port: int) -> subprocess.Popen:
     return subprocess.Popen(
         ["cloudflared", "tunnel", "--url", f"http://localhost:{proxy_port}"],
         stderr=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        text=True,
+        stdout=subprocess.DEVNULL,
     )
 
 
 def wait_for_tunnel_url(proc: subprocess.Popen) -> str | None:
-    """Wait for and extract the tunnel URL from cloudflared output."""
-    if proc.stderr is None:
+    """
+    Wait for and extract the tunnel URL from cloudflared output.
+
+    Gives up after TUNNEL_URL_TIMEOUT seconds or TUNNEL_URL_MAX_LINES lines.
+    A reader thread is used because pipes cannot be polled on Windows; it
+    keeps draining stderr afterwards so cloudflared never blocks on a full
+    pipe.
+    """
+    stderr = proc.stderr
+    if stderr is None:
         return None
 
-    for line in proc.stderr:
-        match = re.search(r"https://[^\s]+\.trycloudflare\.com", line)
-        if match:
-            return match.group(0)
-    return None
+    # stderr is read as raw bytes; only the matched URL is decoded
+    result: queue.Queue[str | None] = queue.Queue()
+
+    def read_stderr() -> None:
+        searching = True
+        for lines, line in enumerate(stderr, 1):
+            if searching:
+                match = TUNNEL_URL_PATTERN.search(line)
+                if match or lines >= TUNNEL_URL_MAX_LINES:
+                    result.put(match.group(0).decode("ascii") if match else None)
+                    searching = False
+        if searching:
+            result.put(None)
+
+    Thread(target=read_stderr, daemon=True).start()
+    try:
+        return result.get(timeout=TUNNEL_URL_TIMEOUT)
+    except queue.Empty:
+        return None
 
 
 def main() -> None:
-    global BRIDGE_TOKEN, TARGET_PORT
+    global BRIDGE_TOKEN, BRIDGE_TOKEN_BYTES, TARGET_PORT
 
     parser = argparse.ArgumentParser(
         description="CircuitForge Local Bridge - Connect local LLMs to CircuitForge",
@@ -265,6 +345,7 @@ Supported LLM servers:
 
     # Generate secure token for this session
     BRIDGE_TOKEN = secrets.token_urlsafe(32)
+    BRIDGE_TOKEN_BYTES = BRIDGE_TOKEN.encode("ascii")
 
     # Start proxy server
     proxy_server, proxy_port = start_proxy_server()
@@ -19,7 +19,7 @@ import { createComponentInstance, ComponentDefinition } from '@/constants/compon
 import { useCircuitStore, useSessionStore, useUIStore, Tool } from '@/stores';
 import { useCloseGuard, useSessionRecovery } from '@/hooks';
 import { api } from '@/services/api';
-import { WebSocketClient } from '@/services/websocket';
+import { WebSocketClient, decodeWireStates } from '@/services/websocket';
 import { exportAsPng, exportAsJson, importFromJson } from '@/services/export';
 import type { SimulationResult } from '@/services/simulation';
 import type { ServerMessage, Position, Annotation, Participant } from '@/types';
@@ -136,6 +136,12 @@ export default function SessionPage() {
             case 'circuit:component:deleted':
                 circuitStore.deleteComponent(message.payload.componentId);
                 break;
+            case 'circuit:batch:deleted':
+                for (const wireId of message.payload.wireIds) {
+                    circuitStore.deleteWire(wireId);
+                }
+                circuitStore.deleteComponent(message.payload.componentId);
+                break;
             case 'circuit:wire:added':
                 circuitStore.addWire(message.payload.wire);
                 break;
@@ -236,7 +242,7 @@ export default function SessionPage() {
                 if (message.payload.isRunning) {
                     const result: SimulationResult = {
                         success: message.payload.errors.length === 0,
-                        wireStates: message.payload.wireStates as Record<string, 'HIGH' | 'LOW' | 'UNDEFINED' | 'ERROR'>,
+                        wireStates: decodeWireStates(message.payload.wireStates),
                         pinStates: message.payload.pinStates as Record<string, Record<string, 'HIGH' | 'LOW' | 'UNDEFINED' | 'ERROR'>>,
                         errors: message.payload.errors,
                     };
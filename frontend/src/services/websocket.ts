@@ -3,14 +3,46 @@
  * Enhanced with leader/follower mode for cross-tab synchronization
  */
 
-import type { ClientMessage, ServerMessage, Position, SyncAction } from '@/types';
+import type { ClientMessage, CompactWireStates, ServerMessage, Position, SyncAction } from '@/types';
+import type { SignalState } from './simulation';
 
 const WS_URL = process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000/api/ws';
+const textDecoder = new TextDecoder();
 
 type MessageHandler = (message: ServerMessage) => void;
 type ActionForwarder = (action: SyncAction) => void;
 type ConnectionMode = 'leader' | 'follower';
 
+// Bursts of server messages may arrive coalesced into a single frame
+interface BatchMessage {
+    type: 'batch';
+    payload: ServerMessage[];
+}
+
+const SIGNAL_NAMES: Record<string, SignalState> = {
+    '1': 'HIGH',
+    '0': 'LOW',
+    'Z': 'UNDEFINED',
+    'X': 'ERROR',
+};
+
+/**
+ * Expand wire states sent as parallel arrays into a wire ID -> state map
+ */
+export function decodeWireStates(
+    wireStates: Record<string, string> | CompactWireStates
+): Record<string, SignalState> {
+    if (!('ids' in wireStates && 'states' in wireStates)) {
+        return wireStates as Record<string, SignalState>;
+    }
+    const { ids, states } = wireStates as CompactWireStates;
+    const result: Record<string, SignalState> = {};
+    for (let i = 0; i < ids.length; i++) {
+        result[ids[i]] = SIGNAL_NAMES[states[i]] ?? 'UNDEFINED';
+    }
+    return result;
+}
+
 interface WebSocketClientOptions {
     onMessage: MessageHandler;
     onConnect?: () => void;
@@ -82,6 +114,8 @@ export class WebSocketClient {
 
         try {
             this.ws = new WebSocket(url);
+            // Server frames are orjson-encoded bytes
+            this.ws.binaryType = 'arraybuffer';
 
             this.ws.onopen = () => {
                 this.reconnectAttempts = 0;
@@ -90,8 +124,15 @@ export class WebSocketClient {
 
             this.ws.onmessage = (event) => {
                 try {
-                    const message: ServerMessage = JSON.parse(event.data);
-                    this.options.onMessage(message);
+                    const raw = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+                    const message: ServerMessage | BatchMessage = JSON.parse(raw);
+                    if (message.type === 'batch') {
+                        for (const item of message.payload) {
+                            this.options.onMessage(item);
+                        }
+                    } else {
+                        this.options.onMessage(message);
+                    }
                 } catch (error) {
                     console.error('Failed to parse WebSocket message:', error);
                 }
@@ -268,12 +268,20 @@ export type ClientMessage =
     | { type: 'simulation:step'; payload: Record<string, never> }
     | { type: 'simulation:state'; payload: { wireStates: Record<string, string>; pinStates: Record<string, Record<string, string>>; errors: Array<{ errorType: string; message: string; componentId?: string; pinId?: string }> } };
 
+// Wire states packed as parallel arrays: one signal character per wire
+// ('1' high, '0' low, 'Z' high impedance, 'X' unknown), in `ids` order
+export interface CompactWireStates {
+    ids: string[];
+    states: string;
+}
+
 // Server -> Client
 export type ServerMessageType =
     | 'sync:state'
     | 'circuit:component:added'
     | 'circuit:component:moved'
     | 'circuit:component:deleted'
+    | 'circuit:batch:deleted'
     | 'circuit:wire:added'
     | 'circuit:wire:deleted'
     | 'circuit:annotation:added'
@@ -300,6 +308,7 @@ export type ServerMessage =
     | { type: 'circuit:component:added'; payload: { component: CircuitComponent; userId: string } }
     | { type: 'circuit:component:moved'; payload: { componentId: string; position: Position; userId: string } }
     | { type: 'circuit:component:deleted'; payload: { componentId: string; userId: string } }
+    | { type: 'circuit:batch:deleted'; payload: { wireIds: string[]; componentId: string; userId: string } }
     | { type: 'circuit:wire:added'; payload: { wire: Wire; userId: string } }
     | { type: 'circuit:wire:deleted'; payload: { wireId: string; userId: string } }
     | { type: 'circuit:annotation:added'; payload: { annotation: Annotation; userId: string } }
@@ -318,7 +327,7 @@ export type ServerMessage =
     | { type: 'session:kicked'; payload: { participantId: string } }
     | { type: 'simulation:started'; payload: { startedBy: string } }
     | { type: 'simulation:stopped'; payload: { stoppedBy: string } }
-    | { type: 'simulation:state:updated'; payload: { isRunning: boolean; wireStates: Record<string, string>; pinStates: Record<string, Record<string, string>>; errors: Array<{ errorType: string; message: string; componentId?: string; pinId?: string }> } }
+    | { type: 'simulation:state:updated'; payload: { isRunning: boolean; wireStates: Record<string, string> | CompactWireStates; pinStates: Record<string, Record<string, string>>; errors: Array<{ errorType: string; message: string; componentId?: string; pinId?: string }> } }
     | { type: 'error'; payload: { code: string; message: string } };
 
 // ============================================================================